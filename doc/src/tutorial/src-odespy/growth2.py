@@ -22,7 +22,7 @@ time_points = numpy.linspace(0, 40, N+1)
 u, t = solver.solve(time_points)
 
 u_exact = f.A*numpy.exp(f.c*t)
-error = numpy.abs(u_exact - u).max()
+error = odespy.errors.Linf(u, u_exact)
 print 'Max deviation of numerical solution:', error
 
 from matplotlib.pyplot import *
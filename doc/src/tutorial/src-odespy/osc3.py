@@ -53,8 +53,7 @@ for solver in solvers:
         u, t = solver.solve(time_points)
 
         theta = u[:,0]
-        error = numpy.abs(theta_exact(t) - theta)
-        error_L2 = sqrt(numpy.sum(error**2)/N)
+        error_L2 = odespy.errors.L2(theta, theta_exact(t))
         if not numpy.isnan(error_L2):  # drop nan (overflow)
             results[solver_name]['dt'].append(t[1] - t[0])
             results[solver_name]['error'].append(error_L2)
@@ -79,8 +79,7 @@ for solver in solvers:
         continue  # continue with next pass in the loop
 
     theta = u[:,0]
-    error = numpy.abs(theta_exact(t) - theta)
-    error_L2 = sqrt(numpy.sum(error**2)/N)
+    error_L2 = odespy.errors.L2(theta, theta_exact(t))
     #print solver_name, error_L2, cpu_time
     results[solver_name]['dt'] = t[1] - t[0]
     results[solver_name]['error'] = error_L2
@@ -0,0 +1,30 @@
+"""Oscillating pendulum for several amplitudes, solved as one batch."""
+
+import odespy, numpy
+from math import pi, sqrt
+
+c = 1
+Thetas = [pi/8, pi/4, pi/2, 3*pi/4]
+
+def f(u, t):
+    # u[:,0] and u[:,1] are theta and omega for all the pendulums
+    theta, omega = u[:,0], u[:,1]
+    return numpy.column_stack([omega, -c*numpy.sin(theta)])
+
+solver = odespy.RK4(f, batch=True)
+solver.set_initial_condition(numpy.array([[Theta, 0] for Theta in Thetas]))
+freq = sqrt(c)      # frequency of oscillations when Theta is small
+period = 2*pi/freq  # the period of the oscillations
+T = 10*period       # final time
+N_per_period = 20   # resolution of one period
+N = int(N_per_period*T/period)
+time_points = numpy.linspace(0, T, N+1)
+
+u, t = solver.solve(time_points)   # u[n,i,:] is pendulum i at t[n]
+
+from matplotlib.pyplot import *
+for i, Theta in enumerate(Thetas):
+    plot(t, u[:,i,0], label='Theta=%.2f' % Theta)
+legend()
+savefig('tmppng'); savefig('tmp.pdf')
+show()
@@ -12,12 +12,7 @@ class WhiteNoiseOscillator:
     def f(self, u, t):
         if not hasattr(self, 'N'):  # is self.N not yet computed?
             # Compute N(t) for all time intervals
-            import numpy
-            numpy.random.seed(12)
-            t = self.solver.t
-            dW = numpy.random.normal(loc=0, scale=1, size=len(t)-1)
-            dt = t[1:] - t[:-1]
-            self.N = self.sigma*dW/numpy.sqrt(dt)
+            self.N = odespy.white_noise(self.solver.t, self.sigma, seed=12)
 
         x, v = u
         N = self.N[self.solver.n]
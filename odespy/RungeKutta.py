@@ -23,6 +23,25 @@ def _calculate_order_1_level(coefficients):
     order = int(np.log(abs(error1/error2))/np.log(t[-1]/t[-2]))
     return order
 
+def _split_butcher_tableau(table):
+    """
+    Return the coefficients in a Butcher tableau as a tuple
+    (factors_u, factors_t, factors_u_new, factors_error):
+    coefficients for the internal stages, for t, for the new u,
+    and for the local error between the two levels (None if
+    the tableau has only one level).
+    """
+    k_len = table.shape[1] - 1   # number of internal stages
+    factors_u = np.asarray(table[:k_len, 1:])
+    factors_t = table[:k_len, 0]
+    factors_u_new = table[k_len, 1:]
+    if table.shape[0] > k_len + 1:
+        factors_error = table[k_len+1, 1:] - factors_u_new
+    else:
+        factors_error = None
+    return factors_u, factors_t, factors_u_new, factors_error
+
+
 class RungeKutta1level(Solver):
     """
     Superclass for explicit 1-level Runge-Kutta methods.  Subclasses
@@ -39,31 +58,29 @@ class RungeKutta1level(Solver):
             order = _calculate_order_1_level(self.butcher_tableau)
         return order
 
+    def initialize_for_solve(self):
+        Solver.initialize_for_solve(self)
+        # Extract coefficients from Butcher-tableau
+        self._factors_u, self._factors_t, self._factors_u_new = \
+            _split_butcher_tableau(self._butcher_tableau)[:3]
+        # intern stages
+        self._k = np.zeros((len(self._factors_t), self.neq), self.dtype)
+
     def advance(self):
         """Advance the solution one time step: t[n] to t[n+1]."""
 
-        f, n, neq = self.f, self.n, self.neq
-        u_n, t_n, t_next = self.u[n], self.t[n], self.t[n+1]
-
-        dt = t_next - t_n
+        f, n, k = self.f, self.n, self._k
+        u_n, t_n = self.u[n], self.t[n]
+        factors_u, factors_t = self._factors_u, self._factors_t
 
-        # Extract coefficients from Butcher-tableau
-        table = self._butcher_tableau
-        k_len = table.shape[1] - 1   # number of internal stages
-
-        # coefficients for internal stages
-        factors_u = np.asarray(table[:k_len, 1:])
-        # coefficients for t
-        factors_t = table[:k_len, 0]
-        # coefficients for u_new
-        factors_u_new = table[k_len, 1:]
+        dt = self.dt_array[n]
 
         # Run algorithm for explicit 1-level RungeKutta method
-        k = np.zeros((k_len, self.neq), float)  # intern stages
-        for m in range(k_len):
-            k_factors = (np.dot(factors_u, k))[m]
+        # (stage m depends on stages 0, ..., m-1 only)
+        for m in range(len(factors_t)):
+            k_factors = np.dot(factors_u[m,:m], k[:m])
             k[m] = f(u_n + dt*k_factors,t_n + dt*factors_t[m])
-        u_new = u_n + dt*(np.dot(factors_u_new, k))
+        u_new = u_n + dt*(np.dot(self._factors_u_new, k))
         return u_new
 
 
@@ -101,6 +118,12 @@ class RungeKutta2level(Adaptive):
     def initialize_for_solve(self):
         Adaptive.initialize_for_solve(self)
         self.info = {'rejected' : 0}
+        # Extract coefficients from Butcher-tableau
+        self._factors_u, self._factors_t, self._factors_u_new, \
+            self._factors_error = \
+            _split_butcher_tableau(self._butcher_tableau)
+        # intern stages
+        self._k = np.zeros((len(self._factors_t), self.neq), self.dtype)
 
     def advance(self):
         """Advance from t[n] to t[n+1] in (small) adaptive steps."""
@@ -108,33 +131,32 @@ class RungeKutta2level(Adaptive):
         f, n, rtol, atol, neq = \
             self.f, self.n, self.rtol, self.atol, self.neq
         u_n, t_n, t_next = self.u[n], self.t[n], self.t[n+1]
-        dt = t_next - t_n
+        dt = self.dt_array[n]
+        min_step, max_step = self.min_step, self.max_step
+        order = float(self._method_order[0])
+        # Diagnostics and statistics are looked up/updated once here
+        # and after the loop below, not in each internal step
+        verbose = self.verbose > 0
+        num_steps = num_accepted = 0
 
         first_step = dt  # try one big step to next desired level
 
         def middle(x,y,z):    # Auxilary function
             return sorted([x,y,z])[1]
 
-        # Extract coefficients from Butcher-tableau
-        table = self._butcher_tableau
-        k_len = table.shape[1] - 1   # number of internal stages
-
-        # coefficients for internal stages
-        factors_u = np.asarray(table[:k_len, 1:])
-        # coefficients for t
-        factors_t = table[:k_len, 0]
-        # coefficients for u_new
-        factors_u_new = table[k_len, 1:]
-
-        # coefficients for local error between 2 levels
-        factors_error = table[k_len+1, 1:] - factors_u_new
+        # Coefficients from Butcher-tableau for internal stages,
+        # t, u_new, and local error between 2 levels
+        factors_u, factors_t, factors_u_new, factors_error = \
+            self._factors_u, self._factors_t, self._factors_u_new, \
+            self._factors_error
+        k_len = len(factors_t)   # number of internal stages
 
         u_intermediate = [u_n,]
         t_intermediate = [t_n,]
         u, t, h = u_n, t_n, first_step               # initial values
-        k = np.zeros((k_len, self.neq), self.dtype)  # intern stages
+        k = self._k                                  # intern stages
 
-        if self.verbose > 0:
+        if verbose:
             print('advance solution in [%s, %s], h=%g' % (t_n, t_next, h))
 
         # Loop until next time point is reached
@@ -142,15 +164,15 @@ class RungeKutta2level(Adaptive):
             u, t = u_intermediate[-1], t_intermediate[-1]
 
             # Internal steps
-            k[:, :] = 0.   # initialization for next step
+            # (stage m depends on stages 0, ..., m-1 only)
             for m in range(k_len):
-                k_factors = (np.dot(factors_u, k))[m]
+                k_factors = np.dot(factors_u[m,:m], k[:m])
                 #print u, u+h*k_factors, f(u+h*k_factor, 0.5), self.dtype
                 k[m] = f(u+h*k_factors, t+h*factors_t[m])
             u_new = u + h*(np.dot(factors_u_new, k))
 
-            self.info['rejected'] += 1  # reduced below if accepted
-            if self.verbose > 0:
+            num_steps += 1
+            if verbose:
                 print('  u(t=%g)=%g: ' % (t+h, u_new)),
 
             # local error between 2 levels
@@ -160,7 +182,7 @@ class RungeKutta2level(Adaptive):
 
             accurate = (error <= tol).all()
 
-            if accurate or h <= self.min_step or h >= self.max_step:
+            if accurate or h <= min_step or h >= max_step:
                 # Accurate enough,
                 # or the step size exceeds valid range,
                 # must accept this solution
@@ -169,32 +191,30 @@ class RungeKutta2level(Adaptive):
                 if not self.disk_storage:
                     self.u_all.append(u_new)
                 self.t_all.append(t+h)
-                self.info['rejected'] -= 1
+                num_accepted += 1
 
-                if self.verbose > 0:
+                if verbose:
                     print('accepted, '),
             else:
-                if self.verbose > 0:
+                if verbose:
                     print('rejected, '),
 
-            if self.verbose > 0:
+            if verbose:
                 print('err=%s, ' % str(error)),
                 if hasattr(self, 'u_exact') and callable(self.u_exact):
                     print('exact-err=%s, ' %
                           (np.asarray(self.u_exact(t+h))-u_new)),
-                if h <= self.min_step:
+                if h <= min_step:
                     print('h=min_step!! '),
 
 
            # Replace 0 values by 1e-16 since we will divide by error
-            error = np.asarray([(1e-16 if x == 0. else x) \
-                                for x in error])
+            error = np.where(error == 0., 1e-16, error)
 
             # Normarized error rate
             rms = error/tol
             rms_norm = np.sqrt(np.sum(rms*rms)/self.neq)
 
-            order = float(self._method_order[0])
             # factor to adjust the size of next step
             # Formula is from <Numerical Methods for Engineers,
             #  Chappra & Cannle>
@@ -205,16 +225,17 @@ class RungeKutta2level(Adaptive):
             h *= s
 
             # step size should be in range [min_step, max_step]
-            h = middle(h, self.min_step, self.max_step)
+            h = middle(h, min_step, max_step)
             # adjust h to fit the last step
             h = min(h, t_next - t_intermediate[-1])
 
-            if self.verbose > 0:
+            if verbose:
                 print('new h=%g' % h)
 
             if h == 0:
                 break
 
+        self.info['rejected'] += num_steps - num_accepted
         return u_new
 
 
@@ -361,6 +382,11 @@ class MyRungeKutta(RungeKutta2level):
     _optional_parameters =  RungeKutta2level._optional_parameters + \
                            ['method_order',]
 
+    def initialize_for_solve(self):
+        # The coefficients are extracted in the superclass method
+        self._butcher_tableau = self.butcher_tableau
+        RungeKutta2level.initialize_for_solve(self)
+
     def validate_data(self):
         if not Adaptive.validate_data(self):
             return False
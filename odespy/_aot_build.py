@@ -0,0 +1,137 @@
+"""
+Ahead-of-time compilation, by ``numba.pycc``, of the time loops in
+ForwardEuler, Heun and RK4, such that no time is spent on JIT
+compilation of the loops when the solvers are used.
+
+An AOT-compiled function cannot take a ``numba.njit`` function as
+argument, so the right-hand side must then be a ``numba.cfunc``
+with one of these signatures::
+
+    from numba import cfunc, carray, types
+
+    # scalar ODE: return f(u, t)
+    @cfunc('f8(f8, f8)')
+    def f(u, t):
+        return -u
+
+    # system of ODEs: store f(u, t) in out
+    @cfunc(types.void(types.CPointer(types.float64), types.float64,
+                      types.CPointer(types.float64)))
+    def f(u_ptr, t, out_ptr):
+        u = carray(u_ptr, 2); out = carray(out_ptr, 2)
+        out[0] = u[1]
+        out[1] = -u[0]
+
+and the solver is constructed with ``backend='numba'``.
+Each ``<method>_scalar(f, u, t)`` and ``<method>_system(f, u, t)``
+function fills the preallocated solution array ``u`` (with ``u[0]``
+already set) at the time points ``t``.
+
+Running this file, as ``setup.py`` does when numba is installed,
+makes the extension module ``_odespy_kernels``. Without that module,
+the functions here are JIT-compiled in the ``_jit`` module instead.
+"""
+
+import numpy as np
+
+
+def euler_scalar(f, u, t):
+    for n in range(t.size - 1):
+        dt = t[n+1] - t[n]
+        u[n+1] = u[n] + dt*f(u[n], t[n])
+
+def euler_system(f, u, t):
+    neq = u.shape[1]
+    K1 = np.empty(neq)
+    for n in range(t.size - 1):
+        dt = t[n+1] - t[n]
+        f(u[n].ctypes, t[n], K1.ctypes)
+        for i in range(neq):
+            u[n+1,i] = u[n,i] + dt*K1[i]
+
+
+def heun_scalar(f, u, t):
+    for n in range(t.size - 1):
+        dt = t[n+1] - t[n]
+        K1 = f(u[n], t[n])
+        u_star = u[n] + dt*K1
+        u[n+1] = u[n] + 0.5*dt*(K1 + f(u_star, t[n+1]))
+
+def heun_system(f, u, t):
+    neq = u.shape[1]
+    K1 = np.empty(neq)
+    K2 = np.empty(neq)
+    u_star = np.empty(neq)
+    for n in range(t.size - 1):
+        dt = t[n+1] - t[n]
+        f(u[n].ctypes, t[n], K1.ctypes)
+        for i in range(neq):
+            u_star[i] = u[n,i] + dt*K1[i]
+        f(u_star.ctypes, t[n+1], K2.ctypes)
+        for i in range(neq):
+            u[n+1,i] = u[n,i] + 0.5*dt*(K1[i] + K2[i])
+
+
+def rk4_scalar(f, u, t):
+    for n in range(t.size - 1):
+        dt = t[n+1] - t[n]
+        dt2 = dt/2.0
+        K1 = dt*f(u[n], t[n])
+        K2 = dt*f(u[n] + 0.5*K1, t[n] + dt2)
+        K3 = dt*f(u[n] + 0.5*K2, t[n] + dt2)
+        K4 = dt*f(u[n] + K3, t[n] + dt)
+        u[n+1] = u[n] + (1/6.0)*(K1 + 2*K2 + 2*K3 + K4)
+
+def rk4_system(f, u, t):
+    neq = u.shape[1]
+    K1 = np.empty(neq)
+    K2 = np.empty(neq)
+    K3 = np.empty(neq)
+    K4 = np.empty(neq)
+    v = np.empty(neq)
+    for n in range(t.size - 1):
+        dt = t[n+1] - t[n]
+        dt2 = dt/2.0
+        f(u[n].ctypes, t[n], K1.ctypes)
+        for i in range(neq):
+            K1[i] = dt*K1[i]
+            v[i] = u[n,i] + 0.5*K1[i]
+        f(v.ctypes, t[n] + dt2, K2.ctypes)
+        for i in range(neq):
+            K2[i] = dt*K2[i]
+            v[i] = u[n,i] + 0.5*K2[i]
+        f(v.ctypes, t[n] + dt2, K3.ctypes)
+        for i in range(neq):
+            K3[i] = dt*K3[i]
+            v[i] = u[n,i] + K3[i]
+        f(v.ctypes, t[n] + dt, K4.ctypes)
+        for i in range(neq):
+            K4[i] = dt*K4[i]
+            u[n+1,i] = u[n,i] + (1/6.0)*(K1[i] + 2*K2[i] + 2*K3[i] + K4[i])
+
+
+kernel_names = [method + '_' + kind
+                for method in ('euler', 'heun', 'rk4')
+                for kind in ('scalar', 'system')]
+
+def make_cc():
+    """Return a numba.pycc.CC object for the _odespy_kernels module."""
+    from numba.pycc import CC
+    from numba import types
+
+    f8 = types.float64
+    signatures = dict(
+        scalar=types.void(types.FunctionType(f8(f8, f8)),
+                          f8[::1], f8[::1]),
+        system=types.void(types.FunctionType(
+            types.void(types.CPointer(f8), f8, types.CPointer(f8))),
+                          f8[:,::1], f8[::1]))
+
+    cc = CC('_odespy_kernels')
+    for name in kernel_names:
+        kind = name.split('_')[1]
+        cc.export(name, signatures[kind])(globals()[name])
+    return cc
+
+if __name__ == '__main__':
+    make_cc().compile()
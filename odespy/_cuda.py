@@ -0,0 +1,133 @@
+"""
+CUDA kernels (via numba.cuda) for RK4 and Heun in batch mode.
+
+One GPU thread integrates one problem of the batch over all time
+points. The right-hand side is a CUDA device function::
+
+    @numba.cuda.jit(device=True)
+    def rhs(u, t, params, out):
+        # store f(u, t) in out; u and out are arrays of length neq
+        # params is an array with the solver's f_args
+        out[0] = ...
+
+The built-in device functions in ``builtin_rhs`` cover common cases
+such that the user does not need to write CUDA code:
+
+============  ====================================================
+Name          Right-hand side (c = f_args[0])
+============  ====================================================
+linear        f(u, t) = c*u
+pendulum      f(u, t) = [u[1], -c*sin(u[0])]
+============  ====================================================
+
+The module is imported by ``Solver._solve_cuda`` only when a solver
+is constructed with ``backend='cuda'``, so numba is not a requirement
+for the rest of the package.
+"""
+
+import math
+import numpy as np
+from numba import cuda, float64
+
+
+@cuda.jit(device=True)
+def linear(u, t, params, out):
+    for i in range(u.shape[0]):
+        out[i] = params[0]*u[i]
+
+@cuda.jit(device=True)
+def pendulum(u, t, params, out):
+    out[0] = u[1]
+    out[1] = -params[0]*math.sin(u[0])
+
+builtin_rhs = dict(linear=linear, pendulum=pendulum)
+
+
+def _make_rk4_kernel(rhs, neq):
+    @cuda.jit
+    def kernel(U0, T, params, out):
+        b = cuda.grid(1)
+        if b >= U0.shape[0]:
+            return
+        u = cuda.local.array(neq, float64)
+        v = cuda.local.array(neq, float64)
+        K1 = cuda.local.array(neq, float64)
+        K2 = cuda.local.array(neq, float64)
+        K3 = cuda.local.array(neq, float64)
+        K4 = cuda.local.array(neq, float64)
+        for i in range(neq):
+            u[i] = U0[b,i]
+            out[0,b,i] = u[i]
+        for n in range(T.shape[0] - 1):
+            dt = T[n+1] - T[n]
+            dt2 = dt/2.0
+            rhs(u, T[n], params, K1)
+            for i in range(neq):
+                K1[i] = dt*K1[i]
+                v[i] = u[i] + 0.5*K1[i]
+            rhs(v, T[n] + dt2, params, K2)
+            for i in range(neq):
+                K2[i] = dt*K2[i]
+                v[i] = u[i] + 0.5*K2[i]
+            rhs(v, T[n] + dt2, params, K3)
+            for i in range(neq):
+                K3[i] = dt*K3[i]
+                v[i] = u[i] + K3[i]
+            rhs(v, T[n] + dt, params, K4)
+            for i in range(neq):
+                K4[i] = dt*K4[i]
+                u[i] = u[i] + (1/6.0)*(K1[i] + 2*K2[i] + 2*K3[i] + K4[i])
+                out[n+1,b,i] = u[i]
+    return kernel
+
+
+def _make_heun_kernel(rhs, neq):
+    @cuda.jit
+    def kernel(U0, T, params, out):
+        b = cuda.grid(1)
+        if b >= U0.shape[0]:
+            return
+        u = cuda.local.array(neq, float64)
+        u_star = cuda.local.array(neq, float64)
+        K1 = cuda.local.array(neq, float64)
+        K2 = cuda.local.array(neq, float64)
+        for i in range(neq):
+            u[i] = U0[b,i]
+            out[0,b,i] = u[i]
+        for n in range(T.shape[0] - 1):
+            dt = T[n+1] - T[n]
+            rhs(u, T[n], params, K1)
+            for i in range(neq):
+                u_star[i] = u[i] + dt*K1[i]
+            rhs(u_star, T[n+1], params, K2)
+            for i in range(neq):
+                u[i] = u[i] + 0.5*dt*(K1[i] + K2[i])
+                out[n+1,b,i] = u[i]
+    return kernel
+
+_kernel_makers = dict(rk4=_make_rk4_kernel, heun=_make_heun_kernel)
+_kernels = {}   # compiled kernels for (method, rhs, neq)
+
+threads_per_block = 256
+
+
+def solve(method, rhs, U0, T, params):
+    """
+    Solve the batch of problems with initial conditions ``U0`` (array
+    of shape (B,neq)) at the time points ``T`` by ``method`` ('rk4' or
+    'heun') and the device function ``rhs``. Return the solution as
+    an array of shape (len(T),B,neq).
+    """
+    key = (method, rhs, U0.shape[1])
+    if key not in _kernels:
+        _kernels[key] = _kernel_makers[method](rhs, U0.shape[1])
+    kernel = _kernels[key]
+
+    U0_d = cuda.to_device(np.ascontiguousarray(U0, dtype=float))
+    T_d = cuda.to_device(np.ascontiguousarray(T, dtype=float))
+    # (an array of length 0 is not accepted by all CUDA drivers)
+    params_d = cuda.to_device(np.array(list(params) or [0.], dtype=float))
+    out_d = cuda.device_array((len(T),) + U0.shape, dtype=float)
+    blocks = (U0.shape[0] + threads_per_block - 1)//threads_per_block
+    kernel[blocks, threads_per_block](U0_d, T_d, params_d, out_d)
+    return out_d.copy_to_host()
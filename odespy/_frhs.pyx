@@ -0,0 +1,62 @@
+# cython: boundscheck=False, wraparound=False
+"""
+Template for a thin Cython wrapper of a right-hand side f(u, t) written
+in C as::
+
+    void user_rhs(double* u, double t, double* out, int n)
+    {
+        /* store f(u, t) in out; u and out have length n */
+    }
+
+``compile_c_rhs`` in ``solvers.py`` writes the C code to
+``user_rhs.h`` (together with ``#define ODESPY_NEQ <neq>``), compiles
+a copy of this file with a unique module name, and wraps the module
+in a ``CompiledRHS`` object. This file is not compiled on its own.
+"""
+
+import numpy as np
+
+
+cdef extern from "user_rhs.h":
+    int ODESPY_NEQ
+    void user_rhs(double* u, double t, double* out, int n) nogil
+
+
+cdef void _rhs(double* u, double t, double* out) noexcept nogil:
+    # f with the signature of numba.cfunc right-hand sides of
+    # systems (see _aot_build), for the compiled time loops
+    user_rhs(u, t, out, ODESPY_NEQ)
+
+
+cdef int _check_length(Py_ssize_t n) except -1:
+    # The C function reads and writes ODESPY_NEQ values
+    if n != ODESPY_NEQ:
+        raise ValueError('u has length %d, but the C function is compiled for %d equations' % (n, ODESPY_NEQ))
+    return 0
+
+
+cpdef void call_rhs(double[::1] u, double t, double[::1] out) except *:
+    """Store f(u, t) in out, passing the array pointers to C."""
+    _check_length(u.shape[0])
+    _check_length(out.shape[0])
+    with nogil:
+        user_rhs(&u[0], t, &out[0], u.shape[0])
+
+
+def evaluate(u, double t):
+    """Return f(u, t) as a new array (u is an array or a list)."""
+    cdef double[::1] u_ = np.ascontiguousarray(u, dtype=np.float64).ravel()
+    _check_length(u_.shape[0])
+    out = np.empty(u_.shape[0])
+    cdef double[::1] out_ = out
+    with nogil:
+        user_rhs(&u_[0], t, &out_[0], u_.shape[0])
+    return out
+
+
+def address():
+    """Return the address of the C function _rhs(u, t, out)."""
+    return <size_t>&_rhs
+
+
+neq = ODESPY_NEQ
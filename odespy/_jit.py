@@ -0,0 +1,143 @@
+"""
+Numba-compiled time loops for the simplest non-adaptive solvers.
+
+Each ``*_step`` function performs one step of a scheme and each
+``*_loop`` function runs the complete time loop over the time points
+``t``, filling the preallocated solution array ``u`` (with ``u[0]``
+already set). The user's right-hand side ``f`` must itself be compiled
+by ``numba.njit`` and is called as ``f(u, t, *f_args)``.
+
+The module is imported by ``Solver._solve_numba`` only when a solver
+is constructed with ``backend='numba'``, so numba is not a requirement
+for the rest of the package.
+"""
+
+import functools
+import numba
+
+
+@numba.njit(cache=True)
+def euler_step(f, u_n, t_n, dt, f_args):
+    return u_n + dt*f(u_n, t_n, *f_args)
+
+@numba.njit(cache=True)
+def euler_loop(f, u, t, f_args):
+    for n in range(t.size - 1):
+        u[n+1] = euler_step(f, u[n], t[n], t[n+1] - t[n], f_args)
+    return u
+
+
+@numba.njit(cache=True)
+def leapfrog_loop(f, u, t, f_args):
+    # Forward Euler for the first step
+    u[1] = euler_step(f, u[0], t[0], t[1] - t[0], f_args)
+    for n in range(1, t.size - 1):
+        u[n+1] = u[n-1] + (t[n+1] - t[n-1])*f(u[n], t[n], *f_args)
+    return u
+
+
+@numba.njit(cache=True)
+def heun_step(f, u_n, t_n, dt, f_args):
+    f_n = f(u_n, t_n, *f_args)
+    u_star = u_n + dt*f_n
+    return u_n + 0.5*dt*(f_n + f(u_star, t_n + dt, *f_args))
+
+@numba.njit(cache=True)
+def heun_loop(f, u, t, f_args):
+    for n in range(t.size - 1):
+        u[n+1] = heun_step(f, u[n], t[n], t[n+1] - t[n], f_args)
+    return u
+
+
+@numba.njit(cache=True)
+def rk2_step(f, u_n, t_n, dt, f_args):
+    K1 = dt*f(u_n, t_n, *f_args)
+    K2 = dt*f(u_n + 0.5*K1, t_n + 0.5*dt, *f_args)
+    return u_n + K2
+
+@numba.njit(cache=True)
+def rk2_loop(f, u, t, f_args):
+    for n in range(t.size - 1):
+        u[n+1] = rk2_step(f, u[n], t[n], t[n+1] - t[n], f_args)
+    return u
+
+
+@numba.njit(cache=True)
+def rk3_step(f, u_n, t_n, dt, f_args):
+    dt2 = dt/2.0
+    K1 = dt*f(u_n, t_n, *f_args)
+    K2 = dt*f(u_n + 0.5*K1, t_n + dt2, *f_args)
+    K3 = dt*f(u_n - K1 + 2*K2, t_n + dt, *f_args)
+    return u_n + (1/6.0)*(K1 + 4*K2 + K3)
+
+@numba.njit(cache=True)
+def rk3_loop(f, u, t, f_args):
+    for n in range(t.size - 1):
+        u[n+1] = rk3_step(f, u[n], t[n], t[n+1] - t[n], f_args)
+    return u
+
+
+@numba.njit(cache=True)
+def rk4_step(f, u_n, t_n, dt, f_args):
+    dt2 = dt/2.0
+    K1 = dt*f(u_n, t_n, *f_args)
+    K2 = dt*f(u_n + 0.5*K1, t_n + dt2, *f_args)
+    K3 = dt*f(u_n + 0.5*K2, t_n + dt2, *f_args)
+    K4 = dt*f(u_n + K3, t_n + dt, *f_args)
+    return u_n + (1/6.0)*(K1 + 2*K2 + 2*K3 + K4)
+
+@numba.njit(cache=True)
+def rk4_loop(f, u, t, f_args):
+    for n in range(t.size - 1):
+        u[n+1] = rk4_step(f, u[n], t[n], t[n+1] - t[n], f_args)
+    return u
+
+
+@numba.njit(cache=True)
+def ab2_loop(f, u, t, f_args, start_step):
+    # start_step (one of the *_step functions) for the first step
+    u[1] = start_step(f, u[0], t[0], t[1] - t[0], f_args)
+    f_n_1 = f(u[0], t[0], *f_args)
+    for n in range(1, t.size - 1):
+        dt = t[n+1] - t[n]
+        f_n = f(u[n], t[n], *f_args)
+        u[n+1] = u[n] + dt/2.*(3*f_n - f_n_1)
+        f_n_1 = f_n
+    return u
+
+
+# Versions of ab2_loop compiled for a given constant time step,
+# only the most recently used ones are kept
+@functools.lru_cache(maxsize=8)
+def _ab2_const_dt_loop(dt):
+    half_dt = dt/2.
+
+    @numba.njit
+    def loop(f, u, t, f_args, start_step):
+        u[1] = start_step(f, u[0], t[0], dt, f_args)
+        f_n_1 = f(u[0], t[0], *f_args)
+        for n in range(1, t.size - 1):
+            f_n = f(u[n], t[n], *f_args)
+            u[n+1] = u[n] + half_dt*(3*f_n - f_n_1)
+            f_n_1 = f_n
+        return u
+
+    return loop
+
+def ab2_const_dt_loop(dt):
+    """
+    Return a version of ab2_loop for the constant time step dt, where
+    dt (and dt/2) are compile-time constants in the loop. The loops
+    for the 8 most recently used values of dt are cached, other
+    values of dt require a new compilation.
+    """
+    return _ab2_const_dt_loop(float(dt))
+
+
+# JIT-compiled versions of the loops for a numba.cfunc right-hand
+# side in _aot_build, used if the _odespy_kernels extension module
+# (the ahead-of-time compiled versions) is not built
+from . import _aot_build
+for _name in _aot_build.kernel_names:
+    globals()[_name] = numba.njit(cache=True)(getattr(_aot_build, _name))
+del _name
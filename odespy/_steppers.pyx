@@ -0,0 +1,146 @@
+# cython: boundscheck=False, wraparound=False, cdivision=True
+"""
+Cython versions of the time loops in ForwardEuler, Heun and RK4,
+and of the general time loop in ``Solver.solve``.
+
+Each ``*_loop(f, t, u, terminate)`` function runs the time loop over
+the time points ``t`` and fills the preallocated, C-contiguous,
+real-valued solution array ``u`` (with ``u[0]`` already set), exactly
+as the ``advance`` method of the corresponding class does in
+``Solver.solve``. ``f(u, t)`` is the solver's wrapped right-hand side
+and is still called as a Python function, but all the arithmetic
+between the calls is done in C. ``terminate`` is None or a function
+``terminate(u, t, step_no)``. The return value is the index of the
+last computed time point.
+
+The module is compiled by ``setup.py`` if Cython is available and is
+used by ``Solver.solve`` when a solver is constructed with
+``backend='cython'``. ``advance_loop`` is used instead by the
+solvers that have no special loop here (when constructed with
+``backend='cython'``).
+"""
+
+import numpy as np
+
+
+cdef class _RHS:
+    """
+    Calls f(x, t) for a vector x stored in a row of a work array and
+    copies the result into another row (f may return its argument
+    or a list).
+    """
+    cdef object f
+    cdef object rows       # rows of the work array as 1D arrays
+    cdef bint scalar       # send x to f as a number?
+
+    def __init__(self, f, rows, scalar):
+        self.f, self.rows, self.scalar = f, rows, scalar
+
+    cdef void eval(self, object x, double t, double[::1] K) except *:
+        """Store f(x, t) in K."""
+        cdef double[::1] fx
+        cdef Py_ssize_t i
+        if self.scalar:
+            x = x[0]
+        fx = np.ascontiguousarray(self.f(x, t), dtype=np.float64).ravel()
+        for i in range(K.shape[0]):
+            K[i] = fx[i]
+
+
+cdef void _euler_step(_RHS f, double t_n, double dt, object u_n_array,
+                      double[::1] u_n, double[::1] u_new,
+                      double[:, ::1] work) except *:
+    cdef Py_ssize_t i
+    cdef double[::1] K1 = work[0]
+    f.eval(u_n_array, t_n, K1)
+    for i in range(u_n.shape[0]):
+        u_new[i] = u_n[i] + dt*K1[i]
+
+
+cdef void _heun_step(_RHS f, double t_n, double dt, object u_n_array,
+                     double[::1] u_n, double[::1] u_new,
+                     double[:, ::1] work) except *:
+    cdef Py_ssize_t i
+    cdef double[::1] K1 = work[0], K2 = work[1], u_star = work[2]
+    f.eval(u_n_array, t_n, K1)
+    for i in range(u_n.shape[0]):
+        u_star[i] = u_n[i] + dt*K1[i]
+    f.eval(f.rows[2], t_n + dt, K2)
+    for i in range(u_n.shape[0]):
+        u_new[i] = u_n[i] + 0.5*dt*(K1[i] + K2[i])
+
+
+cdef void _rk4_step(_RHS f, double t_n, double dt, object u_n_array,
+                    double[::1] u_n, double[::1] u_new,
+                    double[:, ::1] work) except *:
+    cdef Py_ssize_t i, neq = u_n.shape[0]
+    cdef double dt2 = dt/2.0
+    cdef double[::1] K1 = work[0], K2 = work[1], K3 = work[2], K4 = work[3]
+    cdef double[::1] v = work[4]
+    v_array = f.rows[4]
+    f.eval(u_n_array, t_n, K1)
+    for i in range(neq):
+        K1[i] = dt*K1[i]
+        v[i] = u_n[i] + 0.5*K1[i]
+    f.eval(v_array, t_n + dt2, K2)
+    for i in range(neq):
+        K2[i] = dt*K2[i]
+        v[i] = u_n[i] + 0.5*K2[i]
+    f.eval(v_array, t_n + dt2, K3)
+    for i in range(neq):
+        K3[i] = dt*K3[i]
+        v[i] = u_n[i] + K3[i]
+    f.eval(v_array, t_n + dt, K4)
+    for i in range(neq):
+        K4[i] = dt*K4[i]
+        u_new[i] = u_n[i] + (1/6.0)*(K1[i] + 2*K2[i] + 2*K3[i] + K4[i])
+
+
+ctypedef void (*step_t)(_RHS, double, double, object, double[::1],
+                        double[::1], double[:, ::1]) except *
+
+
+cdef Py_ssize_t _loop(step_t step, Py_ssize_t nwork,
+                      object f, object t, object u, object terminate) except -1:
+    cdef double[::1] t_ = t
+    cdef Py_ssize_t n, N = t_.shape[0] - 1
+    cdef bint scalar = u.ndim == 1
+    u_2d = u.reshape(-1, 1) if scalar else u   # view of u
+    cdef double[:, ::1] u_ = u_2d
+    work_array = np.empty((nwork, u_.shape[1]))
+    cdef double[:, ::1] work = work_array
+    cdef _RHS rhs = _RHS(f, list(work_array), scalar)
+
+    for n in range(N):
+        step(rhs, t_[n], t_[n+1] - t_[n], u_2d[n], u_[n], u_[n+1], work)
+        if terminate is not None and terminate(u, t, n+1):
+            return n+1
+    return N
+
+
+def euler_loop(f, t, u, terminate=None):
+    return _loop(_euler_step, 1, f, t, u, terminate)
+
+def heun_loop(f, t, u, terminate=None):
+    return _loop(_heun_step, 3, f, t, u, terminate)
+
+def rk4_loop(f, t, u, terminate=None):
+    return _loop(_rk4_step, 5, f, t, u, terminate)
+
+
+def advance_loop(solver, u, t, terminate=None):
+    """
+    Run the time loop in ``Solver.solve``: for n = 0, 1, ..., set
+    ``solver.n = n`` and store ``solver.advance()`` in ``u[n+1]``
+    (``u`` is ``solver.u`` or the buffer behind it), until the last
+    time point in ``t`` or until ``terminate(solver.u, solver.t, n+1)``
+    returns True. Return the index of the last computed time point.
+    """
+    cdef Py_ssize_t n, N = len(t) - 1
+    advance = solver.advance
+    for n in range(N):
+        solver.n = n
+        u[n+1] = advance()
+        if terminate is not None and terminate(solver.u, solver.t, n+1):
+            return n+1
+    return N
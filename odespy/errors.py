@@ -0,0 +1,44 @@
+"""
+Norms of the error in a numerical solution, computed without the
+temporary arrays made by expressions like ``numpy.abs(u - u_e).max()``
+and ``sqrt(numpy.sum((u - u_e)**2)/N)``.
+
+The difference ``u - u_e`` is stored in ``out`` if given (an array of
+the same shape as ``u``), such that the same buffer can be reused for
+many error computations, e.g., in convergence tests with several
+resolutions and methods. Otherwise, one array is allocated.
+``u`` and ``u_exact`` must be non-empty and have the same shape
+(ValueError is raised otherwise).
+"""
+
+import numpy as np
+
+
+def _difference(u, u_exact, out):
+    u, u_exact = np.asarray(u), np.asarray(u_exact)
+    if u.shape != u_exact.shape:
+        raise ValueError('u has shape %s, but u_exact has shape %s' %
+                         (u.shape, u_exact.shape))
+    if u.size == 0:
+        raise ValueError('u and u_exact are empty')
+    if out is None:
+        out = np.empty(u.shape, np.result_type(u, u_exact))
+    return np.subtract(u, u_exact, out=out)
+
+def Linf(u, u_exact, out=None):
+    """Return max(abs(u - u_exact)), the maximum norm of the error."""
+    diff = _difference(u, u_exact, out)
+    if diff.dtype.kind == 'c':
+        # abs of complex numbers is real and cannot be stored in diff
+        return np.abs(diff).max()
+    np.abs(diff, out=diff)
+    return diff.max()
+
+def L2(u, u_exact, out=None):
+    """
+    Return sqrt(sum(abs(u - u_exact)**2)/N), a discrete L2 norm of the
+    error, where N = len(u) - 1 is the number of time intervals.
+    """
+    diff = _difference(u, u_exact, out).ravel()
+    N = max(len(u) - 1, 1)
+    return np.sqrt(np.vdot(diff, diff).real/N)
@@ -1047,6 +1047,7 @@ class Odepack(Solver):
         self.t = np.asarray(time_points)
         self.initialize_for_solve()
         if not self.validate_data():
+            import pprint
             raise ValueError('Invalid data in "%s":\n%s' % \
                 (self.__class__.__name__,pprint.pformat(self.__dict__)))
 
@@ -1,6 +1,7 @@
 
 import numpy as np
 from . solvers import compile_f77
+from . errors import Linf
 
 
 class Problem:
@@ -95,7 +96,7 @@ class Problem:
             if not (u.shape == u_e.shape):
                 raise ValueError('u has shape %s and u_e has %s' %
                                  (u.shape, u_e.shape))
-            return np.abs(u - u_e).max()
+            return Linf(u, u_e)
         else:
             return np.allclose(u, u_e, rtol, atol)
 
@@ -588,6 +589,6 @@ Radau5Implicit {'rtol': 0.01, 'atol': 0.01, 'max_iter': 10, 'jac': <bound method
                 if r:
                     failure[pname][mname] = False
                 else:
-                    failure[pname][mname] = np.abs(reference_solution - u).max()
+                    failure[pname][mname] = Linf(u, reference_solution)
     return failure
 """
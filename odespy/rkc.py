@@ -178,6 +178,7 @@ ATOL =%s should be either a scalar or a vector of length NEQ=%d.
 
         # Validity-check for values of class attributes
         if not self.validate_data():
+            import pprint
             raise ValueError('Invalid data in "%s":\n%s' % \
                              (self.__class__.__name__,
                               pprint.pformat(self.__dict__)))
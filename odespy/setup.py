@@ -44,6 +44,30 @@ def configuration(parent_package='', top_path=None):
                              sources=[join('radau5','radau5.pyf')],
                              libraries=['_radau5'])
 
+    # Time loops in Cython (optional, used with backend='cython')
+    try:
+        from Cython.Build import cythonize
+    except ImportError:
+        pass
+    else:
+        cythonize(join(config.local_path, '_steppers.pyx'))
+        config.add_extension('_steppers', sources=['_steppers.c'])
+
+    # Ahead-of-time compiled time loops (optional, used with
+    # backend='numba' when f is a numba.cfunc)
+    try:
+        import numba.pycc
+    except ImportError:
+        pass
+    else:
+        sys.path.insert(0, config.local_path)
+        import _aot_build
+        cc = _aot_build.make_cc()
+        cc.compile()
+        config.add_data_files(cc.output_file)
+
+    config.add_data_files('_tutorial.txt')
+    config.add_data_files('_frhs.pyx')   # template used by compile_c_rhs
     config.add_data_dir('tests')
     return config
 
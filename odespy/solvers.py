@@ -113,7 +113,7 @@ for doing one (adaptive) time step, called in the ``advance`` method.
 
 '''
 
-import pprint, sys, os, inspect
+import sys, os, inspect, types
 import numpy as np
 
 # Collection of all possible parameters in all solvers in this package
@@ -146,6 +146,22 @@ _parameters = dict(
         type=bool,
         default=False),
 
+    strict_array_f = dict(
+        help='True if f always returns a numpy array. f is then '\
+             'called without converting its result by numpy.asarray '\
+             '(otherwise the conversion is skipped only if the first '\
+             'call of f returns an array).',
+        type=bool,
+        default=False),
+
+    f_out_arg = dict(
+        help='True if f accepts an array argument out, as in '\
+             '``f(u, t, *f_args, out=out, **f_kwargs)``, and stores '\
+             'the result in out (such that f need not make a new '\
+             'array in each call).',
+        type=bool,
+        default=False),
+
     jac = dict(
         help='Jacobian of right-hand side function f (df/du).',
         default=None,
@@ -168,6 +184,14 @@ _parameters = dict(
         default=1E-4,
         type=float),
 
+    f_vectorized = dict(
+        help='True if f(U, t), for a two-dimensional array U with '\
+             'one state per row, returns the array of f for each row. '\
+             'The finite difference approximation of the Jacobian '\
+             'then needs only one call of f.',
+        default=False,
+        type=bool),
+
     verbose = dict(
         help='Integer reflecting output of intermediate quantities.',
         default=0,
@@ -181,6 +205,63 @@ _parameters = dict(
         default=False,
         type=(str,bool)),
 
+    compact = dict(
+        help='With backend="numba": True for the general compiled '\
+             'time loop, False for a loop compiled with the (constant) '\
+             'time step as a constant (compiled anew for a time '\
+             'step not among the 8 most recently used).',
+        default=True,
+        type=bool),
+    backend = dict(
+        help='Implementation of the time loop: "python" (the standard '\
+             'loop in solve, calling advance at each step), "numba" '\
+             '(the complete time loop compiled by numba; f must then be '\
+             'compiled by numba.njit and f_kwargs cannot be used; this '\
+             'is the default if f is compiled by numba.njit, with a '\
+             'fall back to "python" for problems the compiled loop '\
+             'cannot handle) or '\
+             '"cython" (the time loop in the compiled _steppers module, '\
+             'calling f (or advance, for solvers without a special '\
+             'Cython loop) as a Python function; falls back to "python" '\
+             'if the module is not compiled) or "cuda" (batch mode '\
+             'only: one GPU thread per problem, with cuda_rhs as '\
+             'right-hand side).',
+        default='python',
+        type=str,
+        range=['python', 'numba', 'cython', 'cuda']),
+
+    cuda_rhs = dict(
+        help='Right-hand side used with backend="cuda": the name of a '\
+             'built-in right-hand side ("linear": c*u, "pendulum": '\
+             '[u[1], -c*sin(u[0])], with c=f_args[0]) or a '\
+             'numba.cuda device function rhs(u, t, params, out) '\
+             'storing f(u, t) in out, params being f_args as an array.',
+        type=(str, callable)),
+
+    batch = dict(
+        help='If True, U0 holds the initial conditions of a batch of '\
+             'independent problems along its first axis, U0[i] being '\
+             'the initial condition of problem i, and all problems are '\
+             'advanced together. The solution u then has shape '\
+             '(N+1,)+U0.shape. f(U, t) must be vectorized: with U of '\
+             'shape U0.shape it returns the right-hand sides of all '\
+             'problems in an array of the same shape (and jac returns '\
+             'an array of shape (B,neq,neq)). Use numpy functions '\
+             '(np.sin, not math.sin) on whole columns of U in f, such '\
+             'that the work is done by vectorized numpy loops.',
+        default=False,
+        type=bool),
+
+    u_dtype = dict(
+        help='Data type of the solution array u, e.g. np.float32 '\
+             'to halve the memory traffic in large systems of ODEs '\
+             '(or "bfloat16", which requires the ml_dtypes package). '\
+             'f must then accept u of this type; its return value is '\
+             'converted when u[n+1] is stored. The default is the type '\
+             'of f(U0, t[0]). The compiled backends (numba.cfunc, '\
+             'compile_c_rhs, Cython, Fortran) require float64.',
+        type=(type, np.dtype, str)),
+
     u_exact = dict(
         help='Function of t returning exact solution.',
         default=None,
@@ -459,6 +540,111 @@ def compile_f77(*function_strings, **kwargs):
         return r[0] if len(r) == 1 else t
 
 
+class CompiledRHS(object):
+    """
+    Right-hand side f(u, t) of a system of ODEs compiled from C code
+    by ``compile_c_rhs``. Calling the object from Python passes the
+    array pointers directly to the C function through a thin Cython
+    wrapper (no f2py layer). With ``backend='numba'``, ForwardEuler,
+    Heun and RK4 call the C function directly from their compiled time
+    loops, as for a ``numba.cfunc`` (see ``Solver._solve_numba``).
+    """
+    def __init__(self, module):
+        self.module = module
+        self.neq = module.neq
+        self.address = module.address()
+        self.__name__ = module.__name__
+
+    def __call__(self, u, t):
+        return self.module.evaluate(u, t)
+
+    # Wrapper address protocol of numba (first-class functions)
+    def __wrapper_address__(self):
+        return self.address
+
+    def signature(self):
+        from numba import types
+        f8 = types.float64
+        return types.void(types.CPointer(f8), f8, types.CPointer(f8))
+
+_compiled_rhs = {}   # CompiledRHS objects for (code, neq)
+
+def compile_c_rhs(code, neq):
+    """
+    Compile C code for the right-hand side of a system of ``neq``
+    ODEs and return it as a ``CompiledRHS`` object, to be used as f
+    in a solver. The code must define a function::
+
+        void user_rhs(double* u, double t, double* out, int n)
+
+        /* e.g. for u'' = -u: */
+        void user_rhs(double* u, double t, double* out, int n)
+        {
+            out[0] = u[1];
+            out[1] = -u[0];
+        }
+
+    which stores f(u, t) in ``out`` (u and out have length n = neq).
+    The code is compiled together with the Cython wrapper in
+    ``_frhs.pyx`` (Cython and a C compiler are required), and the
+    extension module is kept in a directory ``odespy_crhs`` in the
+    user's cache directory (``$XDG_CACHE_HOME`` or ``~/.cache``), such
+    that the same code is only compiled once. The directory is only
+    accessible by the user, since the modules in it are imported.
+    The C function gets no extra arguments, so ``f_args`` and
+    ``f_kwargs`` cannot be used with the returned f.
+    """
+    key = (code, neq)
+    if key in _compiled_rhs:
+        return _compiled_rhs[key]
+    try:
+        from Cython.Build import cythonize
+    except ImportError:
+        raise ImportError('Cython is not installed - needed for compile_c_rhs')
+    import hashlib, shutil, importlib.util
+    from setuptools import Distribution, Extension
+
+    modname = '_frhs_' + hashlib.sha1(
+        ('%s\n%d' % (code, neq)).encode()).hexdigest()[:16]
+    cache_dir = os.path.join(
+        os.environ.get('XDG_CACHE_HOME') or
+        os.path.join(os.path.expanduser('~'), '.cache'), 'odespy_crhs')
+    if not os.path.isdir(cache_dir):
+        os.makedirs(cache_dir, mode=0o700)
+    if hasattr(os, 'getuid') and os.stat(cache_dir).st_uid != os.getuid():
+        raise OSError('compile_c_rhs: %s is not owned by the current user' % cache_dir)
+    os.chmod(cache_dir, 0o700)
+    build_dir = os.path.join(cache_dir, modname)
+    if not os.path.isdir(build_dir):
+        os.makedirs(build_dir)
+    with open(os.path.join(build_dir, 'user_rhs.h'), 'w') as f:
+        f.write('#define ODESPY_NEQ %d\n%s\n' % (neq, code))
+    pyxfile = os.path.join(build_dir, modname + '.pyx')
+    shutil.copy(os.path.join(os.path.dirname(__file__), '_frhs.pyx'),
+                pyxfile)
+
+    ext = Extension(modname, [pyxfile], include_dirs=[build_dir])
+    dist = Distribution(dict(ext_modules=cythonize([ext], quiet=True)))
+    build_ext = dist.get_command_obj('build_ext')
+    build_ext.build_lib = build_dir
+    build_ext.build_temp = os.path.join(build_dir, 'build')
+    dist.run_command('build_ext')
+
+    filename = build_ext.get_ext_fullpath(modname)
+    spec = importlib.util.spec_from_file_location(modname, filename)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+
+    try:
+        # Let numba accept the object as a first-class function
+        from numba.core.types import WrapperAddressProtocol
+        WrapperAddressProtocol.register(CompiledRHS)
+    except ImportError:
+        pass
+    _compiled_rhs[key] = CompiledRHS(module)
+    return _compiled_rhs[key]
+
+
 def _format_parameters_table(parameter_names, fixed_width=None):
     """
     Make a table of parameter names and their descriptions.
@@ -481,31 +667,39 @@ def _format_parameters_table(parameter_names, fixed_width=None):
     else:
         c1, c2 = fixed_width
 
-    s = ''  # string to be returned (table)
     hrule = '='*c1 + ' ' + '='*c2 + '\n'
     heading = 'Name' + ' '*(c1-3) + 'Description\n'
-    s += hrule + heading + hrule
+    rows = [hrule + heading + hrule]
 
     for name in parameter_names:
-        s += '%%-%ds' % (c1+1) % name
-        if name in _parameters:
-            text = _parameters[name]['help']
-            if 'default' in _parameters[name]:
-                text += ' (default: %s)' % str(_parameters[name]['default'])
-            # List of wrapped lines
-            if '\n' not in text:
-                text = textwrap.wrap(text, c2, break_long_words=False)
-            else:
-                # Multi-line help string: keep text as is (often computer code)
-                text = text.splitlines()
-            for i in range(1, len(text)):   # add initial space for line 2, ...
-                text[i] = ' '*(c1+1) + text[i]
-            text = '\n'.join(text)
-            s += text
-        s += '\n'
-
-    s += hrule
-    return s
+        # The formatted row for a parameter only depends on the name
+        # and the column widths and is reused in all classes
+        key = (name, c1, c2)
+        if key not in _parameter_rows:
+            row = '%%-%ds' % (c1+1) % name
+            if name in _parameters:
+                text = _parameters[name]['help']
+                if 'default' in _parameters[name]:
+                    text += ' (default: %s)' % str(_parameters[name]['default'])
+                # List of wrapped lines
+                if '\n' not in text:
+                    text = textwrap.wrap(text, c2, break_long_words=False)
+                else:
+                    # Multi-line help string: keep text as is (often computer code)
+                    text = text.splitlines()
+                for i in range(1, len(text)):   # add initial space for line 2, ...
+                    text[i] = ' '*(c1+1) + text[i]
+                row += '\n'.join(text)
+            _parameter_rows[key] = row + '\n'
+        rows.append(_parameter_rows[key])
+
+    rows.append(hrule)
+    return ''.join(rows)
+
+# Formatted rows in _format_parameters_table and complete tables
+# in table_of_parameters (many classes have the same parameters)
+_parameter_rows = {}
+_parameter_tables = {}
 
 def table_of_parameters(classname):
     """
@@ -517,6 +711,9 @@ def table_of_parameters(classname):
     """
     req_prm = getattr(classname, '_required_parameters')
     opt_prm = getattr(classname, '_optional_parameters')
+    key = (tuple(req_prm), tuple(opt_prm))
+    if key in _parameter_tables:
+        return _parameter_tables[key]
     for name in opt_prm:
         if not name in _parameters:
             print('Parameter "%s" used in class %s is not registered in _parameters.' % (name, classname.__name__))
@@ -535,6 +732,7 @@ Optional input arguments:
     indent = 4
     newlines = [' '*indent + line for line in s.splitlines()]
     s = '\n'.join(newlines)
+    _parameter_tables[key] = s
     return s
 
 def typeset_toc(toc):
@@ -549,6 +747,12 @@ def typeset_toc(toc):
     return '\n'.join(lines)
 
 
+# All subclasses of Solver, in the order they are defined
+# (registered by Solver.__init_subclass__)
+_solver_classes = []
+
+# Value of parameters that are not set, in Solver._resolved
+_MISSING = object()
 
 class Solver:
     """
@@ -566,6 +770,7 @@ class Solver:
     =========  ========================================================
     u          array of point values of the solution function
     t          array of time values: u[i] corresponds to t[i]
+    dt_array   array of time steps: dt_array[i] = t[i+1] - t[i]
     n          the most recently computed solution is u[n+1]
     f          function wrapping the user's right-hand side f(u, t),
                used in all algorithms
@@ -577,7 +782,12 @@ class Solver:
 
     _required_parameters = ['f',]
     _optional_parameters = ['f_args', 'f_kwargs', 'complex_valued',
-                            'disk_storage', 'verbose', 'u_exact']
+                            'disk_storage', 'verbose', 'u_exact', 'u_dtype',
+                            'strict_array_f']
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        _solver_classes.append(cls)
 
     def __init__(self, f, **kwargs):
         """
@@ -607,6 +817,15 @@ class Solver:
         arguments in order to specify parameters.
         """
 
+        # The attributes used in every step of the time loop are
+        # created first, in the same order in all solver objects, such
+        # that the objects share one attribute layout (the CPython
+        # 3.11+ interpreter can then specialize the lookups of
+        # self.u, self.t, ... in solve and the advance methods)
+        self.u = self.t = None
+        self.n = 0
+        self.dt_array = None
+
         # self._parameters is the union of optional and required parameters
         # for the class. self._parameters contains all the
         # legal parameters the user of the class can set.
@@ -649,11 +868,16 @@ class Solver:
             # result is an array (without imposing any type - if
             # U0 has integers it is detected and converted to floats
             # to ensure float results from f).
-            if 'f_args' in self._optional_parameters:
-                self.f = lambda u, t:  \
-                    np.asarray(f(u, t, *self.f_args, **self.f_kwargs))
-            else:
-                self.f = lambda u, t: np.asarray(f(u,t))
+            self._wrap_f()
+
+            # Run the complete time loop by numba (see _solve_numba)
+            # if f is compiled by numba.njit and no backend is chosen
+            if 'backend' not in kwargs and \
+               hasattr(self, '_numba_loop') and hasattr(f, 'py_func') and \
+               not (kwargs.get('f_kwargs') or kwargs.get('disk_storage') or
+                    kwargs.get('batch')):
+                self.backend = 'numba'
+                self._backend_auto = True   # see _solve_numba_auto
 
         # Subclass-specific initialization
         self.initialize()
@@ -769,10 +993,62 @@ class Solver:
         # Tests on right name/type/range were successful (if we come here)
         for name in kwargs:
             setattr(self, name, kwargs[name])
+        if 'backend' in kwargs:
+            self._backend_auto = False   # chosen by the user
+
+        # New extra arguments to f require a new wrapper of f
+        if ('f_args' in kwargs or 'f_kwargs' in kwargs) and \
+           hasattr(self, 'users_f'):
+            self._wrap_f()
 
         # all conditional parameters are supplied?
         self.check_conditional_parameters()
 
+    def _wrap_f(self):
+        """
+        Make ``self.f(u, t)`` from the user's function ``self.users_f``.
+        The wrapper is specialized for the current ``f_args`` and
+        ``f_kwargs`` (which are therefore not looked up at every call
+        of f) and must be rebuilt when these change, as ``set`` does.
+        ``solve`` also rebuilds it (see ``_update_f_wrapper``), such
+        that ``f_args`` and ``f_kwargs`` can be assigned directly.
+        ``self._f_raw(u, t)`` is the same function, but returns
+        the user's result as is (not converted to an array).
+        ``initialize_for_solve`` lets ``self.f`` be ``self._f_raw``
+        if f returns an array anyway, and the conversion wrapper
+        (kept as ``self._f_asarray``) otherwise.
+        """
+        f = self.users_f
+        f_args = tuple(getattr(self, 'f_args', None) or ())
+        f_kwargs = getattr(self, 'f_kwargs', None) or {}
+        if isinstance(f, CompiledRHS) and (f_args or f_kwargs):
+            raise ValueError('f_args=%s and f_kwargs=%s cannot be used when f is compiled by compile_c_rhs' % (str(f_args), f_kwargs))
+        asarray = np.asarray
+        if f_kwargs:
+            self.f = lambda u, t: asarray(f(u, t, *f_args, **f_kwargs))
+            self._f_raw = lambda u, t: f(u, t, *f_args, **f_kwargs)
+        elif len(f_args) > 1:
+            self.f = lambda u, t: asarray(f(u, t, *f_args))
+            self._f_raw = lambda u, t: f(u, t, *f_args)
+        elif len(f_args) == 1:
+            a0 = f_args[0]
+            self.f = lambda u, t: asarray(f(u, t, a0))
+            self._f_raw = lambda u, t: f(u, t, a0)
+        else:
+            self.f = lambda u, t: asarray(f(u, t))
+            self._f_raw = f
+        self._f_asarray = self.f
+
+    def _update_f_wrapper(self):
+        """
+        Rebuild ``self.f`` by ``_wrap_f`` for the current ``f_args``
+        and ``f_kwargs`` (which may have been assigned directly instead
+        of by ``set``), unless ``self.f`` is not such a wrapper.
+        """
+        if getattr(self, '_f_asarray', None) is not None and \
+           self.f in (self._f_asarray, self._f_raw):
+            self._wrap_f()
+
     def check_input_types(self, **kwargs):
         """Check whether all existing inputs are of right specified type."""
 
@@ -871,8 +1147,6 @@ class Solver:
         If parameter_name is None, return dict of all inputs.
         """
         if parameter_name is None:
-            # Python v2.7 dict comprehension yields shorter code:
-            # {name: getattr(self, name) for name in self._parameters}
             all_args = dict([(name, getattr(self, name, None)) \
                                  for name in self._parameters \
                                  if hasattr(self, name)])
@@ -883,9 +1157,11 @@ class Solver:
             all_args['name of f'] = self.users_f.__name__
             if 'jac' in all_args:
                 del all_args['jac']
-                all_args['name of jac'] = self.users_jac.__name__
+                if hasattr(self, 'users_jac'):
+                    all_args['name of jac'] = self.users_jac.__name__
 
             if print_info:
+                import pprint
                 print(pprint.pformat(all_args))
             return all_args
 
@@ -908,6 +1184,7 @@ class Solver:
         is pretty printed, otherwise it is returned.
         '''
         if print_info:
+            import pprint
             print('Legal parameters for class %s are:' % self.__class__.__name__)
             print(pprint.pformat(self._parameters))
             return None
@@ -928,11 +1205,11 @@ class Solver:
         if with_f and hasattr(self, 'users_f'):
             if not hasattr(self.users_f, '__name__'):     # class instance?
                 f_name = self.users_f.__class__.__name__
-        else:    # Ordinary functions
-            f_name = self.users_f.__name__
-            if f_name == '<lambda>':   # lambda function
-                f_name = 'lambda u, t: ...'
-        args.append('f=%s' % f_name)
+            else:    # Ordinary functions
+                f_name = self.users_f.__name__
+                if f_name == '<lambda>':   # lambda function
+                    f_name = 'lambda u, t: ...'
+            args.append('f=%s' % f_name)
 
         # form all parameters
         for name in self._parameters:
@@ -957,9 +1234,9 @@ class Solver:
         if hasattr(self, 'users_jac'):
             if hasattr(self.users_jac, '__name__'):     # plain function?
                 f_name = self.users_jac.__name__
-            if f_name == '<lambda>':   # lambda function
-                # f_name = 'lambda u, t: ...'
-                f_name = 'lambda'
+                if f_name == '<lambda>':   # lambda function
+                    # f_name = 'lambda u, t: ...'
+                    f_name = 'lambda'
             else:   # class instance
                 f_name = self.users_jac.__class__.__name__
             args.append('jac=%s' % f_name)
@@ -969,6 +1246,12 @@ class Solver:
             s += '(%s)' % args
         return s
 
+    # True if backend='numba' was chosen by the constructor (not the user)
+    _backend_auto = False
+    # True for methods that require a constant time step (validate_data
+    # then raises ValueError for a non-uniform mesh)
+    _constant_step_only = False
+
     def __repr__(self):
         """Return solvername(f=..., param1=..., etc.)."""
         return self._print_method(with_f=True, default=True)
@@ -990,24 +1273,63 @@ class Solver:
         # and use that as indicator for system of ODEs.
         # The below code should work for U0 having
         # float,int,sympy.mpmath.mpi and other objects as elements.
+        if getattr(self, 'batch', False):
+            # U0[i] is the initial condition of problem no. i
+            U0 = np.asarray(U0)
+            if U0.ndim not in (1, 2):
+                raise ValueError('batch=True: U0 must have shape (B,) or (B,neq), not %s' % str(U0.shape))
+            if U0.dtype.kind in 'iub':
+                U0 = U0.astype(float)    # avoid integer division
+            self.batch_size = U0.shape[0]
+            self.neq = 1 if U0.ndim == 1 else U0.shape[1]
+            self.U0 = U0
+            return
         try:
             self.neq = len(U0)
-            U0 = np.asarray(U0)          # (assume U0 is sequence)
+            # (assume U0 is sequence; store it once as a contiguous
+            # array such that u[n] gets the same layout)
+            U0 = np.ascontiguousarray(U0)
+            if U0.dtype.kind in 'iub':
+                U0 = U0.astype(float)    # avoid integer division
         except TypeError:
             # U0 has no __len__ method, assume it is a scalar
             self.neq = 1
             if isinstance(U0, int):
                 U0 = float(U0)           # avoid integer division
+        f = getattr(self, 'users_f', None)
+        if isinstance(f, CompiledRHS) and f.neq != self.neq:
+            raise ValueError('f is compiled by compile_c_rhs for %d equations, but U0 has %d' % (f.neq, self.neq))
         self.U0 = U0
 
-    def solve(self, time_points, terminate=None):
+    def solve(self, time_points=None, terminate=None,
+              terminate_vectorized=None, start=0.0, dt=None, N=None):
         """
         Compute discrete solution u of the ODE problem at time points
-        specified in the array time_points. An optional user-supplied
+        specified in the array time_points. Instead of time_points,
+        a constant time step ``dt`` and the number of steps ``N`` can
+        be given, and the time points are then start + n*dt,
+        n=0,1,...,N (computed once by ``numpy.arange``), e.g.,
+        ``solver.solve(dt=0.1, N=100)``. An optional user-supplied
         function ``terminate(u, t, step_no)`` can be supplied to
         terminate the solution process (``terminate`` returns True
         or False) at some time earlier than ``time_points[-1]``.
 
+        Calling ``terminate`` at every time step can be expensive for
+        simple ODEs. Alternatively, a vectorized test
+        ``terminate_vectorized(u_chunk, t_chunk)`` can be given. It is
+        called with the values of u and t for the last (up to 64)
+        computed time levels and returns the index in this chunk of the
+        first time level where the solution process is to terminate,
+        or -1 (or None) to continue. For example, stopping when
+        abs(u) <= tol::
+
+            def terminate_vectorized(u, t):
+                hits = np.nonzero(np.abs(u) <= tol)[0]
+                return hits[0] if hits.size else -1
+
+        Note that up to 63 time steps beyond the termination point are
+        then computed (and thrown away).
+
         Most classes in this solver hierarchy inherit this ``solve``
         method and implement their special ``advance`` method to
         advance the solution one step.
@@ -1026,35 +1348,292 @@ class Solver:
            u            : array to hold solution values corresponding to points
            t            : array to hold time values.Usually same as time_points
         """
-        if terminate is None:    # Default function
-            terminate = lambda u, t, step_no: False
-
-        self.t = np.asarray(time_points)
+        if time_points is None:
+            if dt is None or N is None:
+                raise ValueError('%s.solve: time_points or both dt and N must be given' % self.__class__.__name__)
+            time_points = start + dt*np.arange(N+1, dtype=float)
+        self._update_f_wrapper()
+
+        if getattr(self, 'backend', 'python') == 'numba':
+            if not self._backend_auto:
+                return self._solve_numba(time_points, terminate,
+                                         terminate_vectorized)
+            solution = self._solve_numba_auto(time_points, terminate,
+                                              terminate_vectorized)
+            if solution is not None:
+                return solution
+        if getattr(self, 'backend', 'python') == 'cuda':
+            return self._solve_cuda(time_points, terminate,
+                                    terminate_vectorized)
+
+        self.t = np.asarray(time_points, dtype=float)
         self.n = 0  # time step counter
         self.initialize_for_solve()
         self.validate_data()
 
+        if getattr(self, 'backend', 'python') == 'cython' and \
+           self._solve_cython(terminate, terminate_vectorized):
+            return self.u, self.t
+        if self._solve_vectorized(terminate, terminate_vectorized):
+            return self.u, self.t
+
+        # New values are stored directly in the ctypes buffer behind
+        # self.u if there is one (see _allocate_u_buffer)
+        u_store = getattr(self, '_u_buffer', None)
+        if u_store is None:
+            u_store = self.u
+
+        if terminate is None:    # Default function
+            terminate = lambda u, t, step_no: False
+
         # The time loop
         N = self.t.size - 1  # no of intervals
+        chunk = self._terminate_chunk
+        n_checked = 0   # time levels checked by terminate_vectorized
         for n in range(N):
             self.n = n
-            self.u[n+1] = self.advance()   # new value
+            u_store[n+1] = self.advance()   # new value
 
             if self.verbose > 2:
                 print('%s, step %d, t=%g' %
                       (self.__class__.__name__, n+1, self.t[n+1]))
+            n_stop = None
             if terminate(self.u, self.t, n+1):
+                n_stop = n+1
+            elif terminate_vectorized is not None and \
+                 (n+1 - n_checked == chunk or n+1 == N):
+                k = terminate_vectorized(self.u[n_checked+1:n+2],
+                                         self.t[n_checked+1:n+2])
+                if k is not None and k >= 0:
+                    n_stop = n_checked+1 + k
+                n_checked = n+1
+            if n_stop is not None:
                 if self.verbose > 2:
                     print(self.__class__.__name__,
-                          'terminated at t=%g' % self.t[n+1])
+                          'terminated at t=%g' % self.t[n_stop])
+                self.n = n_stop - 1
                 if not self.disk_storage:
-                    self.u, self.t = self.u[:n+2], self.t[:n+2]
+                    self.u, self.t = self.u[:n_stop+1], self.t[:n_stop+1]
                 # else: must keep original size of file, rest is 0
                 break  # terminate time loop over n
         if self.disk_storage:
             self.u.flush()
         return self.u, self.t
 
+    # Max no of time levels sent to terminate_vectorized in solve
+    _terminate_chunk = 64
+
+    def _terminate_after_loop(self, terminate, terminate_vectorized):
+        """
+        Apply ``terminate`` and ``terminate_vectorized`` (see ``solve``)
+        to the complete solution in ``self.u`` and truncate
+        ``self.u`` and ``self.t`` at the first time level where the
+        solution process should have terminated. Used when the time
+        loop is run by compiled code that does not call these functions.
+        """
+        n_stop = self.t.size - 1
+        if terminate_vectorized is not None:
+            k = terminate_vectorized(self.u[1:], self.t[1:])
+            if k is not None and k >= 0:
+                n_stop = k + 1
+        if terminate is not None:
+            for step_no in range(1, n_stop):
+                if terminate(self.u, self.t, step_no):
+                    n_stop = step_no
+                    break
+        self.n = n_stop - 1
+        if n_stop < self.t.size - 1 and not self.disk_storage:
+            self.u, self.t = self.u[:n_stop+1], self.t[:n_stop+1]
+
+    def _solve_numba(self, time_points, terminate=None,
+                     terminate_vectorized=None):
+        """
+        Version of ``solve`` used when ``backend='numba'``: the complete
+        time loop is run by the numba-compiled function in the ``_jit``
+        module whose name is given by the class attribute ``_numba_loop``.
+        The user's ``f`` must be compiled by ``numba.njit``.
+        A ``terminate`` function is applied after the time loop, i.e.,
+        the solution is first computed at all time points and then
+        truncated at the first step where ``terminate`` returns True.
+
+        If ``f`` is instead a ``numba.cfunc`` (with the signature given
+        in the ``_aot_build`` module) or C code compiled by
+        ``compile_c_rhs``, the loops compiled ahead of time in the
+        ``_odespy_kernels`` extension module are used, such that no JIT
+        compilation of the loop is needed.
+        """
+        try:
+            from . import _jit
+        except ImportError:
+            raise ImportError('The numba package must be installed '\
+                              'in order to use backend="numba" in class %s' % \
+                              self.__class__.__name__)
+        if not hasattr(self, '_numba_loop'):
+            raise ValueError('%s has no numba implementation, use backend="python"' % self.__class__.__name__)
+        is_cfunc = hasattr(self.users_f, 'address')
+        if not hasattr(self.users_f, 'py_func') and not is_cfunc:
+            raise TypeError('backend="numba" requires f to be compiled by numba.njit or numba.cfunc, not %s' % type(self.users_f))
+        if is_cfunc and not hasattr(self, '_aot_kernel'):
+            raise TypeError('%s with backend="numba" requires f to be compiled by numba.njit, not numba.cfunc' % self.__class__.__name__)
+        if is_cfunc and self.f_args:
+            raise ValueError('f_args=%s cannot be used when f is a numba.cfunc' % str(self.f_args))
+        if self.f_kwargs:
+            raise ValueError('f_kwargs=%s cannot be used with backend="numba", use f_args' % self.f_kwargs)
+        if self.disk_storage:
+            raise ValueError('disk_storage cannot be used with backend="numba"')
+
+        self.t = np.asarray(time_points, dtype=float)
+        self.n = 0
+        self.initialize_for_solve()
+        self.validate_data()
+
+        if is_cfunc:
+            if self.dtype != np.float64:
+                raise ValueError('f as numba.cfunc requires a real-valued problem with u of type float64')
+            try:
+                from . import _odespy_kernels as kernels
+            except ImportError:
+                kernels = _jit
+            # (a CompiledRHS f has the system signature also for neq=1)
+            scalar = self.neq == 1 and \
+                     not isinstance(self.users_f, CompiledRHS)
+            loop = getattr(kernels, '%s_%s' % (
+                self._aot_kernel, 'scalar' if scalar else 'system'))
+            loop(self.users_f, self.u.reshape(len(self.t), -1)
+                 if self.neq == 1 and not scalar else self.u, self.t)
+        else:
+            loop = self._numba_loop_function(_jit)
+            self.u = loop(self.users_f, self.u, self.t, tuple(self.f_args),
+                          *self._numba_loop_args(_jit))
+        self._terminate_after_loop(terminate, terminate_vectorized)
+        return self.u, self.t
+
+
+    def _solve_numba_auto(self, time_points, terminate=None,
+                          terminate_vectorized=None):
+        """
+        Version of ``_solve_numba`` used when the constructor chose
+        backend='numba' because f is compiled by numba.njit. Return
+        None, and let ``solve`` run the ordinary time loop, if the
+        problem needs that loop (``terminate`` functions called at
+        every step, verbose > 2) or the numba loop cannot handle it
+        (e.g., f returns a tuple, or the start method of
+        AdamsBashforth2 has no numba version). In the latter case,
+        the solver uses backend='python' from now on.
+        """
+        if terminate is not None or terminate_vectorized is not None or \
+           self.verbose > 2:
+            return None
+        from numba.core.errors import NumbaError
+        try:
+            return self._solve_numba(time_points)
+        except (NumbaError, TypeError, ValueError):
+            self.backend = 'python'
+            self._backend_auto = False
+            return None
+
+    def _numba_loop_function(self, _jit):
+        """Return the time loop to be used with ``backend='numba'``."""
+        return getattr(_jit, self._numba_loop)
+
+    def _numba_loop_args(self, _jit):
+        """Extra arguments to the ``_numba_loop`` function in ``_jit``."""
+        return ()
+
+    def _solve_cuda(self, time_points, terminate=None,
+                    terminate_vectorized=None):
+        """
+        Version of ``solve`` used when ``backend='cuda'``: all the
+        problems in the batch are solved on the GPU by the kernel in
+        the ``_cuda`` module for the method given by the class attribute
+        ``_cuda_method``, one thread per problem, with the device
+        function given by the ``cuda_rhs`` parameter as right-hand side.
+        A ``terminate`` function is applied after the time loop.
+        """
+        try:
+            from . import _cuda
+        except ImportError:
+            raise ImportError('The numba package must be installed '\
+                              'in order to use backend="cuda" in class %s' % \
+                              self.__class__.__name__)
+        if not hasattr(self, '_cuda_method'):
+            raise ValueError('%s has no CUDA implementation, use backend="python"' % self.__class__.__name__)
+        if not getattr(self, 'batch', False):
+            raise ValueError('backend="cuda" requires batch=True')
+        if getattr(self, 'cuda_rhs', None) is None:
+            raise ValueError('backend="cuda" requires the cuda_rhs parameter')
+        if self.f_kwargs:
+            raise ValueError('f_kwargs=%s cannot be used with backend="cuda", use f_args' % self.f_kwargs)
+        if self.disk_storage:
+            raise ValueError('disk_storage cannot be used with backend="cuda"')
+        rhs = self.cuda_rhs
+        if isinstance(rhs, str):
+            if rhs not in _cuda.builtin_rhs:
+                raise ValueError('cuda_rhs="%s" is not a built-in right-hand side, legal names are %s' % (rhs, ', '.join(sorted(_cuda.builtin_rhs))))
+            rhs = _cuda.builtin_rhs[rhs]
+
+        self.t = np.asarray(time_points, dtype=float)
+        self.n = 0
+        self.initialize_for_solve()
+        self.validate_data()
+        if str(self.dtype).startswith('complex'):
+            raise ValueError('backend="cuda" cannot be used for complex-valued problems')
+
+        U0 = self.U0.reshape(self.batch_size, self.neq)
+        u = _cuda.solve(self._cuda_method, rhs, U0, self.t, self.f_args)
+        self.u = u.reshape(self.u.shape)
+        self._terminate_after_loop(terminate, terminate_vectorized)
+        return self.u, self.t
+
+    def _solve_cython(self, terminate, terminate_vectorized):
+        """
+        Run the time loop in ``solve`` by the Cython function in the
+        ``_steppers`` module whose name is given by the class attribute
+        ``_cython_loop`` (used when ``backend='cython'``). Classes
+        without such a function use ``_steppers.advance_loop``, the
+        loop in ``solve`` (calling ``advance``) run in Cython.
+        Return False, and let ``solve`` run the ordinary Python loop,
+        if the ``_steppers`` extension module is not compiled or the
+        problem is not supported by the compiled loops (verbose > 2,
+        and, for the special loops, complex-valued problems and batch
+        mode).
+        """
+        try:
+            from . import _steppers
+        except ImportError:
+            if self.verbose > 0:
+                print('%s: the _steppers extension module is not compiled, using backend="python"' % self.__class__.__name__)
+            return False
+        if self.verbose > 2:
+            return False
+        if hasattr(self, '_cython_loop'):
+            if self.dtype != np.float64 or getattr(self, 'batch', False) or \
+               not self.u.flags.c_contiguous:
+                return False
+            loop = getattr(_steppers, self._cython_loop)
+            n = loop(self.f, self.t, self.u, terminate)
+        else:
+            u_store = self.u if self._u_buffer is None else self._u_buffer
+            n = _steppers.advance_loop(self, u_store, self.t, terminate)
+        self.n = n - 1
+        if n < self.t.size - 1 and not self.disk_storage:
+            # terminated
+            self.u, self.t = self.u[:n+1], self.t[:n+1]
+        if terminate_vectorized is not None:
+            self._terminate_after_loop(None, terminate_vectorized)
+        if self.disk_storage:
+            self.u.flush()
+        return True
+
+    def _solve_vectorized(self, terminate, terminate_vectorized):
+        """
+        Subclasses may compute all the time levels in ``solve`` by
+        whole-array operations instead of calling ``advance`` in the
+        time loop, for problems where this is possible. They then
+        return True (and ``solve`` returns the solution), otherwise
+        False and ``solve`` runs the ordinary time loop.
+        """
+        return False
 
     def advance(self):
         """Advance solution one time step."""
@@ -1074,15 +1653,44 @@ class Solver:
         """
         if not hasattr(self, 'U0'):
             raise AttributeError('Cannot solve because set_initial_condition has not been called!')
+        self._update_f_wrapper()   # (not done if solve is overridden)
+
+        # Look up all parameters once, such that the advance methods
+        # can test self._resolved.name is not _MISSING (or self._has(name))
+        # instead of calling hasattr or getattr with a default value
+        self._resolved = types.SimpleNamespace(**dict(
+            (name, getattr(self, name, _MISSING))
+            for name in self._parameters))
+
+        # Time steps, dt_array[n] = t[n+1] - t[n]
+        # (available to the advance methods and the user's f)
+        self.dt_array = np.diff(self.t)
+        self._const_step = None    # see constant_time_step
+        # Time step as a Python float, for the methods that require
+        # a constant time step (see constant_time_step)
+        self._dt = float(self.dt_array[0]) if self.dt_array.size else 0.0
 
         # Detect whether data type is in complex type or not.
         # Try to call f, or use the initial condition.
-        if hasattr(self, 'f'):
+        # (A numba.cfunc f, see _solve_numba, may only accept pointers.)
+        if hasattr(self, 'f') and \
+           not hasattr(getattr(self, 'users_f', None), 'address'):
             if len(self.t) < 2:
                 raise ValueError('time_points array %s must have at least two elements' % repr(self.t))
             if self.verbose > 0:
                 print('Calling f(U0, %g) to determine data type' % self.t[0])
-            value = np.array(self.f(self.U0, self.t[0]))
+            if getattr(self, '_f_asarray', None) is not None and \
+               self.f in (self._f_asarray, self._f_raw):
+                value = self._f_raw(self.U0, self.t[0])
+                # Skip the conversion to array in every call of f
+                # if f returns an array
+                if type(value) is np.ndarray or self.strict_array_f:
+                    self.f = self._f_raw
+                else:
+                    self.f = self._f_asarray
+                value = np.array(value)
+            else:
+                value = np.array(self.f(self.U0, self.t[0]))
         else:
             value = np.asarray(self.U0)
 
@@ -1092,6 +1700,8 @@ class Solver:
         else:
             # Rely on what asarray/array found out of the data type
             self.dtype = value.dtype
+        if self._has('u_dtype'):
+            self.dtype = self._u_dtype()
 
         # Check that consistent self.complex_valued is given
         if str(self.dtype).startswith('complex'):
@@ -1103,11 +1713,29 @@ class Solver:
                 #raise ValueError("Seemingly real-valued ODE problem, but parameter complex_valued is True")
 
         self._allocate_u(self.t)
+        self._u_buffer = None
         # Assume that self.t[0] corresponds to self.U0
         self.u[0] = self.U0
 
         return None
 
+    def _u_dtype(self):
+        """Return the user's u_dtype parameter as a numpy dtype."""
+        if self.u_dtype == 'bfloat16':
+            try:
+                import ml_dtypes
+            except ImportError:
+                raise ImportError('The ml_dtypes package must be installed in order to use u_dtype="bfloat16"')
+            return np.dtype(ml_dtypes.bfloat16)
+        return np.dtype(self.u_dtype)
+
+    def _has(self, name):
+        """
+        Return True if parameter ``name`` was set when ``solve``
+        started (see ``initialize_for_solve``).
+        """
+        return getattr(self._resolved, name, _MISSING) is not _MISSING
+
     def _allocate_u(self, t_array):
         """
         Allocate storage for the solution, given the time points
@@ -1119,28 +1747,55 @@ class Solver:
         if isinstance(self.disk_storage, bool) and self.disk_storage:
             self.disk_storage = 'tmp_odespy.dat'
         N = t_array.size - 1  # no of intervals
-        if self.neq == 1:  # scalar ODEs
-            if self.disk_storage:
-                self.u = np.memmap(self.disk_storage,
-                                   dtype=data_type,
-                                   mode='w+',
-                                   shape=(N+1,))
-            else:
-                self.u = np.zeros(N+1, self.dtype)
-        else:              # systems of ODEs
-            if self.disk_storage:
-                self.u = np.memmap(self.disk_storage,
-                                   dtype=data_type,
-                                   mode='w+',
-                                   shape=(N+1, self.neq))
-            else:
-                self.u = np.zeros((N+1, self.neq), self.dtype)
+        if getattr(self, 'batch', False):
+            # u[n] holds the solution of all problems at time level n
+            shape = (N+1,) + self.U0.shape
+        elif self.neq == 1:  # scalar ODEs
+            shape = (N+1,)
+        else:                # systems of ODEs
+            shape = (N+1, self.neq)
+        if self.disk_storage:
+            self.u = np.memmap(self.disk_storage,
+                               dtype=self.dtype,
+                               mode='w+',
+                               shape=shape)
+        else:
+            # No need to initialize: u[n+1] is always assigned
+            # before it is used
+            self.u = np.empty(shape, self.dtype)
 
 
+    def _allocate_u_buffer(self):
+        """
+        Let the solution array self.u of a real scalar ODE be a view of
+        a ctypes array of doubles, stored as self._u_buffer. The time
+        loop in ``solve`` and the advance method can then store and
+        fetch Python floats in this buffer without going through
+        numpy's item assignment and indexing. self.u is returned to
+        the user as usual (the buffer is not copied).
+        """
+        if self.disk_storage or self.dtype != np.float64 or \
+           self.u.ndim != 1:
+            return
+        import ctypes
+        self._u_buffer = (ctypes.c_double*self.u.size)()
+        self.u = np.frombuffer(self._u_buffer, dtype=np.float64)
+        self.u[0] = self.U0
+
     def constant_time_step(self):
-        """Check if self.t has a uniform partition."""
-        return np.allclose(self.t,
-                           np.linspace(self.t[0], self.t[-1], len(self.t)))
+        """
+        Check if self.t has a uniform partition. The result is
+        computed once in each solve. Round-off in the time steps,
+        which grows with the size of the time points, is accepted.
+        """
+        if getattr(self, '_const_step', None) is None:
+            d = getattr(self, 'dt_array', None)
+            if d is None or d.size != len(self.t) - 1:
+                d = np.diff(self.t)
+            atol = 100*np.finfo(float).eps*np.abs(self.t).max()
+            self._const_step = d.size == 0 or \
+                               np.allclose(d, d[0], rtol=1E-6, atol=atol)
+        return self._const_step
 
 
     def validate_data(self):
@@ -1392,15 +2047,110 @@ class ForwardEuler(Solver):
     Forward Euler scheme::
 
         u[n+1] = u[n] + dt*f(u[n], t[n])
+
+    For large systems of ODEs, u[n+1] is computed in place in the
+    solution array, without temporary arrays.
+
+    If f(u,t) = A*u for a constant coefficient matrix A (or number),
+    and the solver is constructed with ``f_is_linear=True``, the
+    scheme is u[n+1] = (I + dt*A)*u[n] and all the time levels are
+    computed by whole-array operations instead of a loop over n
+    (for scalar ODEs, and for systems of at most 64 ODEs with
+    a uniform time mesh). A is found by evaluating f at t[0].
+    If f has a constant term (f(0, t) != 0) or A depends on t (A is
+    compared at t[0], the middle time point and t[-1]), the ordinary
+    time loop is used.
     """
     quick_description = 'The simple explicit (forward) Euler scheme'
 
+    _optional_parameters = Solver._optional_parameters + \
+                           ['backend', 'batch', 'f_is_linear']
+    _numba_loop = 'euler_loop'
+    _aot_kernel = 'euler'
+    _cython_loop = 'euler_loop'
+    # Smallest size of u[n] where computing in place pays off
+    _inplace_min_size = 100000
+    # Largest system where the time levels of a linear problem are
+    # computed from the powers of I + dt*A
+    _linear_max_size = 64
+
+    def initialize_for_solve(self):
+        Solver.initialize_for_solve(self)
+        self.__dict__.pop('advance', None)
+        if self.u[0].size >= self._inplace_min_size:
+            self.advance = self._advance_inplace
+
+        self._linear_matrix = None
+        if getattr(self, 'f_is_linear', False) and \
+           not getattr(self, 'batch', False) and self.verbose <= 2:
+            t = self.t
+            if self.u.ndim == 1 or \
+               (self.u.ndim == 2 and
+                self.u.shape[1] <= self._linear_max_size and
+                self.constant_time_step()):
+                A = self._linear_matrix_at(t[0])
+                # f_is_linear also allows f = A(t)*u + b(t), but the
+                # whole-array computation requires b = 0 and constant A
+                b = np.asarray(self.f(np.zeros_like(self.u[0]), t[0]))
+                tol = 1E-12*max(1, np.abs(A).max())
+                if np.abs(b).max() <= tol and \
+                   np.allclose(self._linear_matrix_at(t[-1]), A,
+                               rtol=1E-12, atol=tol) and \
+                   np.allclose(self._linear_matrix_at(t[t.size//2]), A,
+                               rtol=1E-12, atol=tol):
+                    self._linear_matrix = A
+
+    def _linear_matrix_at(self, t):
+        """
+        Return A in f(u, t) = A*u (a number for scalar ODEs) computed
+        from f(e_j, t), which is column j of A.
+        """
+        if self.u.ndim == 1:
+            return np.asarray(self.f(np.ones_like(self.u[0]), t)).item()
+        I = np.eye(self.u.shape[1], dtype=self.u.dtype)
+        return np.column_stack(
+            [np.asarray(self.f(e_j, t)).ravel() for e_j in I])
+
+    def _solve_vectorized(self, terminate, terminate_vectorized):
+        A = self._linear_matrix
+        if A is None:
+            return False
+        u, dt = self.u, self.dt_array
+        if u.ndim == 1:
+            u[1:] = u[0]*np.cumprod(1 + dt*A)
+        else:
+            # u[s+k] = M^k u[s], M = I + dt*A, in chunks of K time levels
+            N = dt.size
+            K = min(N, self._terminate_chunk)
+            M = np.eye(A.shape[0], dtype=u.dtype) + dt[0]*A
+            powers = np.empty((K,) + M.shape, dtype=u.dtype)
+            powers[0] = M
+            for k in range(1, K):
+                np.dot(M, powers[k-1], out=powers[k])
+            for s in range(0, N, K):
+                m = min(K, N - s)
+                u[s+1:s+m+1] = np.matmul(powers[:m], u[s])
+        self.n = self.t.size - 2
+        if terminate is not None or terminate_vectorized is not None:
+            self._terminate_after_loop(terminate, terminate_vectorized)
+        if self.disk_storage:
+            self.u.flush()
+        return True
+
     def advance(self):
         u, f, n, t = self.u, self.f, self.n, self.t
-        dt = t[n+1] - t[n]
+        dt = self.dt_array[n]
         u_new = u[n] + dt*f(u[n], t[n])
         return u_new
 
+    def _advance_inplace(self):
+        """As advance, but computes u[n+1] in place in self.u."""
+        u, n = self.u, self.n
+        u_new = u[n+1]
+        np.multiply(self.f(u[n], self.t[n]), self.dt_array[n], out=u_new)
+        u_new += u[n]
+        return u_new
+
 Euler = ForwardEuler   # synonym
 
 
@@ -1418,6 +2168,9 @@ class Leapfrog(Solver):
     """
     quick_description = 'Standard explicit Leapfrog scheme'
 
+    _optional_parameters = Solver._optional_parameters + ['backend']
+    _numba_loop = 'leapfrog_loop'
+
     def advance(self):
         u, f, n, t = self.u, self.f, self.n, self.t
 
@@ -1425,7 +2178,7 @@ class Leapfrog(Solver):
             dt2 = t[n+1] - t[n-1]
             u_new = u[n-1] + dt2*f(u[n], t[n])
         else:
-            dt = t[n+1] - t[n]
+            dt = self.dt_array[n]
             u_new = u[n] + dt*f(u[n], t[n])
         return u_new
 
@@ -1460,7 +2213,7 @@ class LeapfrogFiltered(Solver):
             u_new = u[n-1] + dt2*f(u[n], t[n])
             u[n] = u[n] + gamma*(u[n-1] - 2*u[n] + u_new)
         else:
-            dt = t[n+1] - t[n]
+            dt = self.dt_array[n]
             u_new = u[n] + dt*f(u[n], t[n])
         return u_new
 
@@ -1479,11 +2232,19 @@ class Heun(Solver):
     """
     quick_description = "Heun's explicit method (similar to RK2)"
 
+    _optional_parameters = Solver._optional_parameters + \
+                           ['backend', 'batch', 'cuda_rhs']
+    _numba_loop = 'heun_loop'
+    _aot_kernel = 'heun'
+    _cython_loop = 'heun_loop'
+    _cuda_method = 'heun'
+
     def advance(self):
         u, f, n, t = self.u, self.f, self.n, self.t
-        dt = t[n+1] - t[n]
-        u_star = u[n] + dt*f(u[n], t[n])  # Forward Euler step
-        u_new = u[n] + 0.5*dt*(f(u[n], t[n]) + f(u_star, t[n+1]))
+        dt = self.dt_array[n]
+        f_n = f(u[n], t[n])
+        u_star = u[n] + dt*f_n  # Forward Euler step
+        u_new = u[n] + 0.5*dt*(f_n + f(u_star, t[n+1]))
         return u_new
 
 
@@ -1499,9 +2260,12 @@ class RK2(Solver):
     """
     quick_description = "Explicit 2nd-order Runge-Kutta method"
 
+    _optional_parameters = Solver._optional_parameters + ['backend']
+    _numba_loop = 'rk2_loop'
+
     def advance(self):
         u, f, n, t = self.u, self.f, self.n, self.t
-        dt = t[n+1] - t[n]
+        dt = self.dt_array[n]
         K1 = dt*f(u[n], t[n])
         K2 = dt*f(u[n] + 0.5*K1, t[n] + 0.5*dt)
         u_new = u[n] + K2
@@ -1520,12 +2284,74 @@ class RK4(Solver):
            K2 = dt*f(u[n] + 0.5*K1, t[n] + 0.5*dt)
            K3 = dt*f(u[n] + 0.5*K2, t[n] + 0.5*dt)
            K4 = dt*f(u[n] + K3, t[n] + dt)
+
+    For systems of ODEs, the stages are computed in arrays allocated
+    once in ``initialize_for_solve``, such that no temporary arrays
+    are made in the time loop. In batch mode with large batches, the
+    final update of u is computed by numexpr (if installed).
+
+    If f is a ``LinearRHS`` object (f(u, t) = A*u with constant A),
+    u is instead advanced by the exact propagator exp(A*dt), and the
+    computed u is the exact solution.
     """
     quick_description = "Explicit 4th-order Runge-Kutta method"
 
+    _optional_parameters = Solver._optional_parameters + \
+                           ['backend', 'batch', 'cuda_rhs']
+    _numba_loop = 'rk4_loop'
+    _aot_kernel = 'rk4'
+    _cython_loop = 'rk4_loop'
+    _cuda_method = 'rk4'
+    # Smallest U0.size in batch mode where numexpr pays off
+    _numexpr_min_size = 50000
+
+    def initialize_for_solve(self):
+        Solver.initialize_for_solve(self)
+        self._numexpr = None
+        if getattr(self, 'batch', False) and \
+           self.U0.size >= self._numexpr_min_size:
+            try:
+                import numexpr
+                self._numexpr = numexpr
+            except ImportError:
+                pass
+
+        # Choose the implementation of advance for this problem
+        self.__dict__.pop('advance', None)
+        batch = getattr(self, 'batch', False)
+        if getattr(self.users_f, 'is_linear', False) and not batch and \
+           self.backend == 'python':
+            # Exact propagators exp(A*dt) for each distinct dt
+            self._propagators = {}
+            for dt in np.unique(self.dt_array):
+                self._propagators[dt] = self.users_f.propagator(dt)
+            self.advance = self._advance_linear
+            return
+        if self.neq > 1 or batch:
+            # K1, K2, K3, K4 and an array for u values
+            self._stages = [np.empty(self.u.shape[1:], self.dtype)
+                            for i in range(5)]
+            self.advance = self._advance_inplace
+        if self.dtype == np.float64 and not batch and \
+           self.neq in (1, 2) and hasattr(self, '_f_raw') and \
+           self.backend in ('python', 'cython'):
+            # Small real problems: compute with Python floats instead
+            # of arrays if f returns numbers
+            if self.neq == 1:
+                value = self._f_raw(float(self.U0), self.t[0])
+                if isinstance(value, float):  # (also np.float64)
+                    self.advance = self._advance_scalar
+                    self._allocate_u_buffer()
+            else:
+                value = self._f_raw(np.array(self.U0, float), self.t[0])
+                if len(value) == 2 and \
+                   isinstance(value[0], float) and \
+                   isinstance(value[1], float):
+                    self.advance = self._advance_d2
+
     def advance(self):
         u, f, n, t = self.u, self.f, self.n, self.t
-        dt = t[n+1] - t[n]
+        dt = self.dt_array[n]
         dt2 = dt/2.0
         K1 = dt*f(u[n], t[n])
         K2 = dt*f(u[n] + 0.5*K1, t[n] + dt2)
@@ -1534,6 +2360,64 @@ class RK4(Solver):
         u_new = u[n] + (1/6.0)*(K1 + 2*K2 + 2*K3 + K4)
         return u_new
 
+    def _advance_linear(self):
+        """Exact step u[n+1] = exp(A*dt)*u[n] for f = LinearRHS(A)."""
+        n = self.n
+        Phi = self._propagators[self.dt_array[n]]
+        return np.dot(Phi, self.u[n])
+
+    def _advance_scalar(self):
+        """As advance, but for a scalar ODE with Python floats."""
+        f, n, t = self._f_raw, self.n, self.t
+        u = self._u_buffer if self._u_buffer is not None else self.u
+        u_n, t_n, dt = float(u[n]), float(t[n]), float(self.dt_array[n])
+        dt2 = dt/2.0
+        K1 = dt*f(u_n, t_n)
+        K2 = dt*f(u_n + 0.5*K1, t_n + dt2)
+        K3 = dt*f(u_n + 0.5*K2, t_n + dt2)
+        K4 = dt*f(u_n + K3, t_n + dt)
+        return u_n + (1/6.0)*(K1 + 2*K2 + 2*K3 + K4)
+
+    def _advance_d2(self):
+        """As advance, but for 2 ODEs with Python floats."""
+        f, n, t, array = self._f_raw, self.n, self.t, np.array
+        x, y = self.u[n].tolist()
+        t_n, dt = float(t[n]), float(self.dt_array[n])
+        dt2 = dt/2.0
+        Kx1, Ky1 = f(array((x, y)), t_n)
+        Kx1 *= dt;  Ky1 *= dt
+        Kx2, Ky2 = f(array((x + 0.5*Kx1, y + 0.5*Ky1)), t_n + dt2)
+        Kx2 *= dt;  Ky2 *= dt
+        Kx3, Ky3 = f(array((x + 0.5*Kx2, y + 0.5*Ky2)), t_n + dt2)
+        Kx3 *= dt;  Ky3 *= dt
+        Kx4, Ky4 = f(array((x + Kx3, y + Ky3)), t_n + dt)
+        Kx4 *= dt;  Ky4 *= dt
+        return (x + (1/6.0)*(Kx1 + 2*Kx2 + 2*Kx3 + Kx4),
+                y + (1/6.0)*(Ky1 + 2*Ky2 + 2*Ky3 + Ky4))
+
+    def _advance_inplace(self):
+        """As advance, but with all arithmetics in preallocated arrays."""
+        u, f, n, t = self.u, self.f, self.n, self.t
+        dt = self.dt_array[n]
+        dt2 = dt/2.0
+        K1, K2, K3, K4, v = self._stages
+        u_n = u[n]
+        K1[...] = f(u_n, t[n]);  K1 *= dt
+        np.multiply(K1, 0.5, out=v);  v += u_n
+        K2[...] = f(v, t[n] + dt2);  K2 *= dt
+        np.multiply(K2, 0.5, out=v);  v += u_n
+        K3[...] = f(v, t[n] + dt2);  K3 *= dt
+        np.add(K3, u_n, out=v)
+        K4[...] = f(v, t[n] + dt);  K4 *= dt
+        if self._numexpr is not None:
+            return self._numexpr.evaluate(
+                'u_n + (1/6.0)*(K1 + 2*K2 + 2*K3 + K4)', out=v)
+        # v = u_n + (1/6.0)*(K1 + 2*K2 + 2*K3 + K4)
+        np.multiply(K2, 2, out=v);  v += K1
+        K3 *= 2;  v += K3;  v += K4
+        v *= 1/6.0;  v += u_n
+        return v
+
 
 class RK3(Solver):
     """
@@ -1549,9 +2433,12 @@ class RK3(Solver):
     """
     quick_description = "Explicit 3rd-order Runge-Kutta method"
 
+    _optional_parameters = Solver._optional_parameters + ['backend']
+    _numba_loop = 'rk3_loop'
+
     def advance(self):
         u, f, n, t = self.u, self.f, self.n, self.t
-        dt = t[n+1] - t[n]
+        dt = self.dt_array[n]
         dt2 = dt/2.0
         K1 = dt*f(u[n], t[n])
         K2 = dt*f(u[n] + 0.5*K1, t[n] + dt2)
@@ -1569,10 +2456,38 @@ class AdamsBashforth2(Solver):
     for constant time step dt.
 
     RK2 is used as default solver in the first step.
+    For systems of ODEs, u[n+1] is computed without temporary arrays:
+    in a help array reused in every step, or, for large systems, in
+    place in the solution array. If f can store its result in a given
+    array (f_out_arg=True), f(u[n], t[n]) is stored alternately in two
+    help arrays (one holds f at the previous time level).
+    With backend='numba' and compact=False, the time loop is
+    compiled for the given time step.
     """
     quick_description = "Explicit 2nd-order Adams-Bashforth method"
 
-    _optional_parameters = Solver._optional_parameters + ['start_method',]
+    _optional_parameters = Solver._optional_parameters + \
+                           ['start_method', 'backend', 'compact', 'f_out_arg']
+    _numba_loop = 'ab2_loop'
+    _constant_step_only = True
+    # Step functions in _jit for the start methods with backend='numba'
+    _numba_start_steps = dict(ForwardEuler='euler_step', Heun='heun_step',
+                              RK2='rk2_step', RK3='rk3_step', RK4='rk4_step')
+    # Smallest size of u[n] where computing in place pays off
+    _inplace_min_size = 100000
+
+    def _numba_loop_args(self, _jit):
+        start_method = self.start_method
+        if not isinstance(start_method, str):
+            start_method = start_method.__name__
+        if start_method not in self._numba_start_steps:
+            raise ValueError('start_method=%s cannot be used with backend="numba", use one of %s' % (start_method, ', '.join(sorted(self._numba_start_steps))))
+        return (getattr(_jit, self._numba_start_steps[start_method]),)
+
+    def _numba_loop_function(self, _jit):
+        if not self.compact and self.constant_time_step():
+            return _jit.ab2_const_dt_loop(self.t[1] - self.t[0])
+        return getattr(_jit, self._numba_loop)
 
     def initialize_for_solve(self):
         # New solver instance for first steps
@@ -1580,23 +2495,44 @@ class AdamsBashforth2(Solver):
         # Create variables for holding f at previous time levels
         self.f_n_1 = None
         Solver.initialize_for_solve(self)
+        self._half_dt = 0.5*self._dt   # dt is constant, see validate_data
+        self.__dict__.pop('advance', None)
+        if self.u[0].size >= self._inplace_min_size:
+            self.advance = self._advance_inplace
+        elif self.u.ndim > 1:
+            self._rhs_scratch = np.empty_like(self.u[0])
+            self.advance = self._advance_scratch
+        self._f_buf = None
+        if self.f_out_arg and self.u.ndim > 1:
+            # f_n is stored in _f_buf[_f_idx], f_n_1 in the other array
+            self._f_buf = np.empty((2,) + self.u[0].shape, self.dtype)
+            self._f_idx = 0
+            users_f, f_args, f_kwargs = \
+                self.users_f, tuple(self.f_args), self.f_kwargs
+            self._f_out = lambda u, t, out: \
+                users_f(u, t, *f_args, out=out, **f_kwargs)
+
+    def _f_n_buffered(self):
+        """Return f(u[n], t[n]) stored in the next help array."""
+        n = self.n
+        f_n = self._f_buf[self._f_idx]
+        self._f_out(self.u[n], self.t[n], f_n)
+        self._f_idx ^= 1
+        return f_n
 
     def validate_data(self):
         """Check that the time steps are constant."""
         if not self.constant_time_step():
-            print('%s must have constant time step' % self.__name__)
-            return False
-        else:
-            return True
+            raise ValueError('%s must have constant time step, the time points are not uniformly spaced' % self.__class__.__name__)
+        return True
 
     def advance(self):
         u, f, n, t = self.u, self.f, self.n, self.t
 
         if n >= 1:
-            dt = t[n+1] - t[n]  # must be constant
-            self.f_n = f(u[n], t[n])
-            u_new = u[n] + dt/2.*(3*self.f_n - self.f_n_1)
-            self.f_n_1 = self.f_n
+            f_n = f(u[n], t[n])
+            u_new = u[n] + self._half_dt*(3*f_n - self.f_n_1)
+            self.f_n_1 = f_n
         else:
             # User-specified method for the first step
             self.starter.set_initial_condition(u[n])
@@ -1607,6 +2543,39 @@ class AdamsBashforth2(Solver):
 
         return u_new
 
+    def _advance_inplace(self):
+        """As advance, but computes u[n+1] in place in self.u."""
+        u, n = self.u, self.n
+        if n < 1:
+            return AdamsBashforth2.advance(self)
+
+        f_n = self.f(u[n], self.t[n]) if self._f_buf is None else \
+              self._f_n_buffered()
+        # u_new = u[n] + dt/2.*(3*f_n - f_n_1)
+        u_new = u[n+1]
+        np.multiply(f_n, 3, out=u_new);  u_new -= self.f_n_1
+        u_new *= self._half_dt;  u_new += u[n]
+        self.f_n_1 = f_n
+        return u_new
+
+    def _advance_scratch(self):
+        """
+        As advance, but computes u[n+1] in the help array
+        self._rhs_scratch (copied to self.u by solve).
+        """
+        u, n = self.u, self.n
+        if n < 1:
+            return AdamsBashforth2.advance(self)
+
+        f_n = self.f(u[n], self.t[n]) if self._f_buf is None else \
+              self._f_n_buffered()
+        # u_new = u[n] + dt/2.*(3*f_n - f_n_1)
+        u_new = self._rhs_scratch
+        np.multiply(f_n, 3, out=u_new);  u_new -= self.f_n_1
+        u_new *= self._half_dt;  u_new += u[n]
+        self.f_n_1 = f_n
+        return u_new
+
 
 class AdamsBashforth3(Solver):
     """
@@ -1622,6 +2591,7 @@ class AdamsBashforth3(Solver):
     quick_description = "Explicit 3rd-order Adams-Bashforth method"
 
     _optional_parameters = Solver._optional_parameters + ['start_method',]
+    _constant_step_only = True
 
     def initialize_for_solve(self):
         # New solver instance for first steps
@@ -1633,16 +2603,14 @@ class AdamsBashforth3(Solver):
 
     def validate_data(self):
         if not self.constant_time_step():
-            print('%s must have constant time step' % self.__name__)
-            return False
-        else:
-            return True
+            raise ValueError('%s must have constant time step, the time points are not uniformly spaced' % self.__class__.__name__)
+        return True
 
     def advance(self):
         u, f, n, t = self.u, self.f, self.n, self.t
 
         if n >= 2:
-            dt = t[n+1] - t[n]  # must be constant
+            dt = self._dt  # constant (checked in validate_data)
             self.f_n = f(u[n], t[n])
             u_new = u[n] + dt/12.*(23*self.f_n - 16*self.f_n_1 + 5*self.f_n_2)
             self.f_n_1, self.f_n_2, self.f_n = self.f_n, self.f_n_1, self.f_n_2
@@ -1676,6 +2644,7 @@ class AdamsBashMoulton2(Solver):
     quick_description = "Explicit 2nd-order Adams-Bashforth-Moulton method"
 
     _optional_parameters = Solver._optional_parameters + ['start_method',]
+    _constant_step_only = True
 
     def initialize_for_solve(self):
         # New solver instance for first steps
@@ -1686,16 +2655,14 @@ class AdamsBashMoulton2(Solver):
 
     def validate_data(self):
         if not self.constant_time_step():
-            print('%s must have constant time step' % self.__name__)
-            return False
-        else:
-            return True
+            raise ValueError('%s must have constant time step, the time points are not uniformly spaced' % self.__class__.__name__)
+        return True
 
     def advance(self):
         u, f, n, t = self.u, self.f, self.n, self.t
 
         if n >= 2:
-            dt = t[n+1] - t[n]  # must be constant
+            dt = self._dt  # constant (checked in validate_data)
             self.f_n = f(u[n], t[n])
             predictor = u[n] + dt/12.*(23.*self.f_n - 16*self.f_n_1 + \
                                   5*self.f_n_2)
@@ -1730,6 +2697,7 @@ class AdamsBashforth4(Solver):
     quick_description = "Explicit 4th-order Adams-Bashforth method"
 
     _optional_parameters = Solver._optional_parameters + ['start_method',]
+    _constant_step_only = True
 
     def initialize_for_solve(self):
         # New solver instance for first steps
@@ -1740,16 +2708,14 @@ class AdamsBashforth4(Solver):
 
     def validate_data(self):
         if not self.constant_time_step():
-            print('%s must have constant time step' % self.__name__)
-            return False
-        else:
-            return True
+            raise ValueError('%s must have constant time step, the time points are not uniformly spaced' % self.__class__.__name__)
+        return True
 
     def advance(self):
         u, f, n, t = self.u, self.f, self.n, self.t
 
         if n >= 3:
-            dt = t[n+1] - t[n]  # must be constant
+            dt = self._dt  # constant (checked in validate_data)
             self.f_n = f(u[n], t[n])
             u_new = u[n] + dt/24.*(55.*self.f_n - 59*self.f_n_1 + \
                                   37*self.f_n_2 - 9*self.f_n_3)
@@ -1787,6 +2753,7 @@ class AdamsBashMoulton3(Solver):
     quick_description = "Explicit 3rd-order Adams-Bashforth-Moulton method"
 
     _optional_parameters = Solver._optional_parameters + ['start_method',]
+    _constant_step_only = True
 
     def initialize_for_solve(self):
         # New solver instance for first steps
@@ -1797,16 +2764,14 @@ class AdamsBashMoulton3(Solver):
 
     def validate_data(self):
         if not self.constant_time_step():
-            print('%s must have constant time step' % self.__name__)
-            return False
-        else:
-            return True
+            raise ValueError('%s must have constant time step, the time points are not uniformly spaced' % self.__class__.__name__)
+        return True
 
     def advance(self):
         u, f, n, t = self.u, self.f, self.n, self.t
 
         if n >= 3:
-            dt = t[n+1] - t[n]  # must be constant
+            dt = self._dt  # constant (checked in validate_data)
             self.f_n = f(u[n], t[n])
             predictor = u[n] + dt/24.*(55.*self.f_n - 59*self.f_n_1 + \
                                   37*self.f_n_2 - 9*self.f_n_3)
@@ -1881,7 +2846,7 @@ class EulerCromer(Solver):
         u[1], u[3], etc. are positions.
         """
         u, f, n, t = self.u, self.f, self.n, self.t
-        dt = t[n+1] - t[n]
+        dt = self.dt_array[n]
         u_new = u[n].copy()
         # March forward velocities
         f_n = f(u[n], t[n])
@@ -1912,7 +2877,7 @@ class StaggeredMidpoint(Solver):
         u[1], u[3], etc. are positions at t=i*dt.
         """
         u, f, n, t = self.u, self.f, self.n, self.t
-        dt = t[n+1] - t[n]
+        dt = self.dt_array[n]
         u_new = u[n].copy()  # just need to allocate
         f_n = f(u[n], t[n])
         # March forward velocities
@@ -1948,18 +2913,20 @@ class MidpointIter(Solver):
     def adjust_parameters(self):
         self._parameters['max_iter']['default'] = 3
 
-    def advance(self):
-        if not hasattr(self, 'v'):  # v is a help array needed in the method
-            if self.neq == 1:
-                # Scalar ODE: v can be one-dim array
-                self.v = np.zeros(self.max_iter+1, self.u.dtype)
-            else:
-                # System of ODEs: v must be two-dim array
-                self.v = np.zeros((self.max_iter+1, self.neq), self.u.dtype)
+    def initialize_for_solve(self):
+        Solver.initialize_for_solve(self)
+        # v is a help array needed in the method
+        if self.neq == 1:
+            # Scalar ODE: v can be one-dim array
+            self.v = np.zeros(self.max_iter+1, self.u.dtype)
+        else:
+            # System of ODEs: v must be two-dim array
+            self.v = np.zeros((self.max_iter+1, self.neq), self.u.dtype)
 
+    def advance(self):
         u, f, n, t, v = \
            self.u, self.f, self.n, self.t, self.v
-        dt = t[n+1] - t[n]
+        dt = self.dt_array[n]
 
         v[0] = u[n]
         q = 0
@@ -1975,11 +2942,15 @@ class MidpointIter(Solver):
         return u_new
 
 
-def approx_Jacobian(f, u0, t0, h):
+def approx_Jacobian(f, u0, t0, h, vectorized=False):
     """
     Compute approximate Jacobian of fucntion f at current point (u0,t0).
     Method: forward finite difference approximation with step
     size h.
+    If ``vectorized`` is true, f accepts a two-dimensional array
+    of states (one state per row, see the ``f_vectorized`` parameter)
+    and is called once with all the perturbed states u0 + h*e_i,
+    instead of once for each i.
     Output: a two-dimensional array holding the Jacobian matrix.
     """
     u0 = np.asarray(u0)
@@ -1987,8 +2958,11 @@ def approx_Jacobian(f, u0, t0, h):
     neq = u0.size
     if neq == 1:
         u_ph = u0 + h
-        J = (f(u_ph, t0) - f(u0, t0))/h
+        J = (f(u_ph, t0) - f0)/h
         return J
+    elif vectorized:
+        U_ph = u0 + h*np.eye(neq)
+        return (np.asarray(f(U_ph, t0)) - f0).transpose()/h
     else:
         J = np.zeros((neq, neq), float)
         for i in range(neq):
@@ -1998,6 +2972,68 @@ def approx_Jacobian(f, u0, t0, h):
         return J.transpose()
 
 
+def _f_accepts_states(f, u0, t0):
+    """
+    Test if f(U, t0), for a two-dimensional array U with one state
+    per row, returns the array whose row k is f(U[k], t0). The test
+    calls f with neq+1 states near u0 (so that U is not square) and
+    compares with one call per state. Return False if f fails,
+    returns an array of the wrong shape, or gives different values.
+    """
+    u0 = np.asarray(u0, dtype=float)
+    neq = u0.size
+    if u0.ndim != 1 or neq < 2:
+        return False
+    U = u0 + 1E-3*(1 + abs(u0))*np.random.RandomState(1).rand(neq+1, neq)
+    try:
+        F = np.asarray(f(U, t0), dtype=float)
+        F_single = np.array([np.asarray(f(U[k], t0), dtype=float)
+                             for k in range(neq+1)])
+    except Exception:
+        return False
+    return F.shape == F_single.shape and \
+           np.allclose(F, F_single, rtol=1E-12, atol=1E-14)
+
+
+class LinearRHS(object):
+    """
+    Right-hand side f(u, t) = A*u of a linear ODE system with a
+    constant coefficient matrix A (or a number A for a scalar ODE)::
+
+        f = LinearRHS([[0, 1], [-c, 0]])
+        solver = odespy.RK4(f)
+
+    ``f`` can be used as any other right-hand side, but RK4 detects
+    the attribute ``is_linear`` and then advances the solution by
+    the exact propagator exp(A*dt), computed once for each distinct
+    time step, instead of evaluating the RK4 stages. The result is
+    the exact solution of the ODE (to machine precision).
+    Computing exp(A*dt) requires scipy.
+    """
+    is_linear = True
+
+    def __init__(self, A):
+        self.A = np.asarray(A)
+        if self.A.ndim not in (0, 2) or \
+           self.A.ndim == 2 and self.A.shape[0] != self.A.shape[1]:
+            raise ValueError('LinearRHS: A must be a number or a square matrix, not of shape %s' % str(self.A.shape))
+
+    def __call__(self, u, t):
+        if self.A.ndim == 0:
+            return self.A*u
+        return self.A.dot(u)
+
+    def propagator(self, dt):
+        """Return exp(A*dt), the exact solution operator over dt."""
+        if self.A.ndim == 0:
+            return np.exp(self.A*dt)
+        try:
+            from scipy.linalg import expm
+        except ImportError:
+            raise ImportError('scipy is not installed - needed for LinearRHS.propagator')
+        return expm(self.A*dt)
+
+
 class odefun_sympy(Solver):
     """
     Wrapper for the sympy.mpmath.odefun method, which applies a high-order
@@ -2067,7 +3103,8 @@ class SolverImplicit(Solver):
 
     _optional_parameters = Solver._optional_parameters + \
         ['f_is_linear', 'jac', 'jac_args', 'jac_kwargs', 'h_in_fd_jac',
-         'nonlinear_solver', 'max_iter', 'eps_iter', 'relaxation']
+         'f_vectorized', 'nonlinear_solver', 'max_iter', 'eps_iter',
+         'relaxation']
 
     def initialize_for_solve(self):
         self.num_iterations_total = 0
@@ -2089,10 +3126,19 @@ class SolverImplicit(Solver):
                 if getattr(self, 'nonlinear_solver', None) is None:
                     self.nonlinear_solver = 'Picard'  # default if no jac provided
                 elif getattr(self, 'nonlinear_solver') == 'Newton':
+                    if getattr(self, 'batch', False):
+                        raise ValueError('%s: batch=True: must provide jac for Newton iteration' % self.__class__.__name__)
                      # Approximate jacobian with finite difference approx
                     self.users_jac = approx_Jacobian
+                    # One call of f for all perturbed states if the
+                    # user says f is vectorized (checked once here)
+                    vectorized = self.f_vectorized and self.neq > 1
+                    if vectorized and \
+                       not _f_accepts_states(self.f, self.U0, self.t[0]):
+                        raise ValueError('%s: f_vectorized=True, but f(U, t) does not return f for each row of a two-dimensional array U' % self.__class__.__name__)
                     self.jac = lambda u, t: \
-                        self.users_jac(self.f, u, t, self.h_in_fd_jac)
+                        self.users_jac(self.f, u, t, self.h_in_fd_jac,
+                                       vectorized)
             else:
                 if getattr(self, 'nonlinear_solver', None) is None:
                     self.nonlinear_solver = 'Newton'  # default if jac provided
@@ -2107,13 +3153,13 @@ class SolverImplicit(Solver):
     def advance(self):
         n = self.n
         un, f, t_new, tn = self.u[n], self.f, self.t[n+1], self.t[n]
-        dt = t_new - tn
+        dt = self.dt_array[n]
 
         # General solver routine with Newton or Picard
         # Newton with Finite Difference or exact Jac
         i, error = 1, 1E+30
         # Forward Euler step for initial guess for nonlinear solver
-        u_new = un + (t_new-tn)*f(un,tn)
+        u_new = un + dt*f(un,tn)
         # control by number of intern steps and error tolerance
         if self.verbose > 1:
             print('%s.advance w/%s: t=%g, n=%d: ' % \
@@ -2122,7 +3168,7 @@ class SolverImplicit(Solver):
         while i <= self.max_iter and error > self.eps_iter:
             if self.nonlinear_solver == 'Linear':
                 rhs, A = self.linear_update(u_new)
-                u_new = rhs/A if self.neq == 1 else np.linalg.solve(A, rhs)
+                u_new = self._linear_solve(A, rhs)
                 error = 0
                 break
             elif self.nonlinear_solver == 'Picard':
@@ -2131,7 +3177,7 @@ class SolverImplicit(Solver):
                 u_new_ = self.Picard2_update(u_new)
             elif self.nonlinear_solver == 'Newton':
                 F, Jac = self.Newton_system(u_new)
-                du = F/Jac if self.neq == 1 else np.linalg.solve(Jac, F)
+                du = self._linear_solve(Jac, F)
                 u_new_ = u_new - du
             error = np.abs(u_new_ - u_new).max()
             r = self.relaxation    # relaxation factor
@@ -2146,6 +3192,26 @@ class SolverImplicit(Solver):
             raise ValueError('%s w/%s not converged:\n   difference in solution between last two iterations: %g > eps_iter=%g after %s iterations.' % (self.__class__.__name__, self.nonlinear_solver, error, self.eps_iter, self.max_iter))
         return u_new
 
+    def _identity(self):
+        """Identity matrix to be used in linear systems for a step."""
+        if self._has('batch') and self._resolved.batch and self.neq == 1:
+            return 1.0   # jac returns one number per problem
+        return np.eye(self.neq)
+
+    def _matvec(self, A, u):
+        """Matrix-vector product, also for a batch of problems."""
+        if self._has('batch') and self._resolved.batch:
+            return A*u if self.neq == 1 else np.matmul(A, u[...,None])[...,0]
+        return np.dot(A, u)
+
+    def _linear_solve(self, A, b):
+        """Solve A*x = b, also for a batch of problems."""
+        if self.neq == 1:
+            return b/A
+        if self._has('batch') and self._resolved.batch:
+            return np.linalg.solve(A, b[...,None])[...,0]
+        return np.linalg.solve(A, b)
+
     def Picard2_update(self, ukp1):
         raise NotImplementedError('Picard2 method not implemented for solver %s' % self.__class__.__name__)
 
@@ -2175,7 +3241,7 @@ class BackwardEuler(SolverImplicit):
         # u[n+1] = u[n] + dt*(K(ukp1)*u[n+1] + b)
         # (I - dt*K)*u[n+1] = u[n] + dt*b
         u, f, n, t = self.u, self.f, self.n, self.t
-        dt = t[n+1] - t[n]
+        dt = self.dt_array[n]
         K = self.jac(ukp1, t[n+1])
         H = np.dot(K, ukp1)
         b = self.f(ukp1, t[n+1]) - np.dot(K, ukp1)
@@ -2185,17 +3251,17 @@ class BackwardEuler(SolverImplicit):
 
     def Picard_update(self, ukp1):
         u, f, n, t = self.u, self.f, self.n, self.t
-        dt = t[n+1] - t[n]
+        dt = self.dt_array[n]
         return u[n] + dt*f(ukp1, t[n+1])
 
     def Picard2_update(self, ukp1):
         u, f, n, t = self.u, self.f, self.n, self.t
-        dt = t[n+1] - t[n]
+        dt = self.dt_array[n]
         return u[n]/(1 - dt*f(ukp1, t[n+1])/ukp1)
 
     def Newton_system(self, ukp1):
         u, f, n, t = self.u, self.f, self.n, self.t
-        dt = t[n+1] - t[n]
+        dt = self.dt_array[n]
         F = ukp1 - (u[n] + dt*f(ukp1, t[n+1]))
         J = np.eye(self.neq) - dt*self.jac(ukp1, t[n+1])
         return F, J
@@ -2215,7 +3281,7 @@ class Backward2Step(SolverImplicit):
         u, f, n, t = self.u, self.f, self.n, self.t
         if n == 0:
             # Backward Euler as starter
-            dt = t[n+1] - t[n]
+            dt = self.dt_array[n]
             return u[n] + dt*f(ukp1, t[n+1])
         else:
             dt2 = t[n+1] - t[n-1]
@@ -2226,7 +3292,7 @@ class Backward2Step(SolverImplicit):
         u, f, n, t = self.u, self.f, self.n, self.t
         if n == 0:
             # Backward Euler as starter
-            dt = t[n+1] - t[n]
+            dt = self.dt_array[n]
             K = self.jac(ukp1, t[n+1])
             b = self.f(ukp1, t[n+1]) - np.dot(K, ukp1)
             rhs = u[n] + dt*b
@@ -2243,7 +3309,7 @@ class Backward2Step(SolverImplicit):
         u, f, n, t = self.u, self.f, self.n, self.t
         if n == 0:
             # Backward Euler as starter
-            dt = t[n+1] - t[n]
+            dt = self.dt_array[n]
             F = ukp1 - (u[n] + dt*f(ukp1, t[n+1]))
             J = np.eye(self.neq) - dt*self.jac(ukp1, t[n+1])
         else:
@@ -2267,29 +3333,30 @@ class ThetaRule(SolverImplicit):
     """
     quick_description = "Unified Forward/Backward Euler and Midpoint methods"
 
-    _optional_parameters = SolverImplicit._optional_parameters + ['theta']
+    _optional_parameters = SolverImplicit._optional_parameters + \
+                           ['theta', 'batch']
 
     def Picard_update(self, ukp1):
         u, f, n, t, theta = self.u, self.f, self.n, self.t, self.theta
-        dt = t[n+1] - t[n]
+        dt = self.dt_array[n]
         return u[n] + theta*dt*f(ukp1, t[n+1]) + (1-theta)*dt*f(u[n], t[n])
 
     def Newton_system(self, ukp1):
         u, f, n, t, theta = self.u, self.f, self.n, self.t, self.theta
-        dt = t[n+1] - t[n]
+        dt = self.dt_array[n]
         F = ukp1 - (u[n] + theta*dt*f(ukp1, t[n+1]) + (1-theta)*dt*f(u[n],t[n]))
-        J = np.eye(self.neq) - theta*dt*self.jac(ukp1, t[n+1])
+        J = self._identity() - theta*dt*self.jac(ukp1, t[n+1])
         return F, J
 
     def linear_update(self, ukp1):
         """jac contains the coefficient matrix K: f=K*u+b."""
         u, f, n, t, theta = self.u, self.f, self.n, self.t, self.theta
-        dt = t[n+1] - t[n]
+        dt = self.dt_array[n]
         K = self.jac(ukp1, t[n+1])
-        b = self.f(ukp1, t[n+1]) - np.dot(K, ukp1)
-        b_1 = self.f(u[n], t[n]) - np.dot(K, u[n])
+        b = self.f(ukp1, t[n+1]) - self._matvec(K, ukp1)
+        b_1 = self.f(u[n], t[n]) - self._matvec(K, u[n])
         rhs = u[n] + (1-theta)*dt*f(u[n],t[n]) + dt*(theta*b + (1-theta)*b_1)
-        A = np.eye(self.neq) - theta*dt*K
+        A = self._identity() - theta*dt*K
         return rhs, A
 
 class MidpointImplicit(SolverImplicit):
@@ -2304,12 +3371,12 @@ class MidpointImplicit(SolverImplicit):
 
     def Picard_update(self, ukp1):
         u, f, n, t = self.u, self.f, self.n, self.t
-        dt = t[n+1] - t[n]
+        dt = self.dt_array[n]
         return u[n] + dt*f((ukp1 + u[n])/2., t[n] + dt/2.)
 
     def Newton_system(self, ukp1):
         u, f, n, t = self.u, self.f, self.n, self.t
-        dt = t[n+1] - t[n]
+        dt = self.dt_array[n]
         F = ukp1 - (u[n] + dt*f((ukp1 + u[n])/2., t[n] + dt/2.))
         J = np.eye(self.neq) - dt*self.jac((ukp1 + u[n])/2., t[n] + dt/2.)
         return F, J
@@ -2500,9 +3567,10 @@ class RK34(Adaptive):
         u, t, t_np1 = self.u[n], self.t[n], self.t[n+1]
         dt = t_np1 -t
 
-        min_step = getattr(self, 'min_step', dt/1000.)
-        max_step = getattr(self, 'max_step', dt)
-        first_step = getattr(self, 'first_step', dt)
+        # (set in Adaptive.initialize_for_solve)
+        min_step = self._resolved.min_step
+        max_step = self._resolved.max_step
+        first_step = self._resolved.first_step
         if first_step > dt:
             first_step = dt
         self.h = first_step
@@ -2538,7 +3606,7 @@ class RK34(Adaptive):
                     else:
                         print('rejected, ',)
                     print(' err=%g (tol=%.1E), ' % (error, tol),)
-                    if hasattr(self, 'u_exact'):
+                    if self._has('u_exact'):
                         print('exact-err: %g, ' %
                               (np.abs(np.asarray(self.u_exact(t))-u))),
 
@@ -2577,7 +3645,7 @@ class RKFehlberg(Adaptive):
         h, min_step, max_step = self.first_step, self.min_step, self.max_step
         u_n, t_n, t_np1 = self.u[n], self.t[n], self.t[n+1]
 
-        dt = t_np1 - t_n
+        dt = self.dt_array[n]
 
         # coefficients in Butcher tableau
         c = (1/4.,
@@ -3019,22 +4087,36 @@ class odelab(Adaptive):
 
 #------------------------------------------------------------------------------
 
+# Names of all and of all available solver classes, computed in the
+# first call to list_all_solvers and list_available_solvers
+# (list_all_solvers is called in every solver's constructor)
+_all_solvers = None
+_available_solvers = None
+
 def list_all_solvers():
     """Return all solver classes in this package, excluding superclasses."""
     # Important: odespy.__init__.py must import all solver classes
     # into the namespace for this function to work properly.
+    global _all_solvers
+    if _all_solvers is not None:
+        return list(_all_solvers)
 
     exclude = ('Solver','Adaptive', 'PyDS', 'ode_scipy', 'Odepack',
                'RungeKutta1level', 'RungeKutta2level', 'SolverImplicit',
                'MyRungeKutta', 'MySolver', 'AdaptiveResidual')
     import odespy
     classes = inspect.getmembers(odespy, inspect.isclass)
-    solvers = [solver[0] for solver in classes
-               if solver[0] not in exclude]
-    return solvers
+    _all_solvers = tuple(solver[0] for solver in classes
+                         if solver[0] not in exclude and
+                         issubclass(solver[1], Solver))
+    return list(_all_solvers)
 
 def list_available_solvers():
     """Return all available solver classes in this package."""
+    global _available_solvers
+    if _available_solvers is not None:
+        return list(_available_solvers)
+
     available_solvers = []
     import odespy
     all_solvers = list_all_solvers()
@@ -3052,6 +4134,7 @@ def list_available_solvers():
                 # Failed to initialize this solver.
                 # Perhaps the required dependency is not installed.
                 pass
+    _available_solvers = tuple(available_solvers)
     return available_solvers
 
 def list_not_suitable_complex_solvers():
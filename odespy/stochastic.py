@@ -0,0 +1,20 @@
+"""
+Helper functions for stochastic differential equations.
+"""
+
+import numpy as np
+
+
+def white_noise(t, sigma, seed=None):
+    """
+    Return white noise N(t[i]) = sigma*dW[i]/sqrt(t[i+1] - t[i]) for
+    all the time intervals given by the time points ``t``, where dW[i]
+    are independent standard normally distributed numbers. The numbers
+    are drawn by numpy's ``Generator`` API (PCG64), which is faster than
+    the legacy ``numpy.random.normal`` and has no global state. A given
+    ``seed`` gives the same noise in every call, for example when
+    the noise is computed anew for each of several solvers.
+    """
+    rng = np.random.default_rng(seed)
+    dt = np.diff(np.asarray(t, dtype=float))
+    return sigma*rng.standard_normal(dt.size)/np.sqrt(dt)
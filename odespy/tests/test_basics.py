@@ -347,6 +347,25 @@ def test_terminate():
     nt.assert_almost_equal(diff, exact_diff, delta=1E-14)
     print('...ok')
 
+def test_terminate_vectorized():
+    problem = Exponential
+    def terminate_vectorized(u, t):
+        hits = np.nonzero(u <= problem['stop_value'])[0]
+        return hits[0] if hits.size else -1
+
+    time_points = np.linspace(0., 2., 201)
+    solver = odespy.RK4(problem['f'])
+    solver.set_initial_condition(problem['u0'])
+    u, t = solver.solve(time_points, terminate=problem['terminate'])
+    solver = odespy.RK4(problem['f'])
+    solver.set_initial_condition(problem['u0'])
+    u2, t2 = solver.solve(time_points,
+                          terminate_vectorized=terminate_vectorized)
+    print('Testing RK4 with terminate_vectorized function')
+    nt.assert_equal(len(u2), len(u))
+    nt.assert_almost_equal(np.abs(u - u2).max(), 0, delta=1E-14)
+    print('...ok')
+
 def test_switch_to():
     problem = Exponential
     solver = odespy.RKFehlberg(problem['f'])
@@ -360,6 +379,556 @@ def test_switch_to():
     nt.assert_almost_equal(diff, exact_diff, delta=1E-14)
     print('...ok')
 
+def test_numba_backend():
+    try:
+        import numba
+    except ImportError:
+        import unittest
+        raise unittest.SkipTest('numba is not installed')
+
+    @numba.njit
+    def f(u, t):
+        return np.array([u[1], -u[0]])
+
+    time_points = np.linspace(0, 5, 51)
+    for solver_class in (odespy.ForwardEuler, odespy.Leapfrog, odespy.Heun,
+                         odespy.RK2, odespy.RK3, odespy.RK4,
+                         odespy.AdamsBashforth2):
+        print('Testing %s with backend="numba"' % solver_class.__name__)
+        solver = solver_class(f, backend='python')
+        solver.set_initial_condition([0., 1.])
+        u, t = solver.solve(time_points)
+        solver = solver_class(f)   # numba is the default for njit f
+        nt.assert_equal(solver.backend, 'numba')
+        solver.set_initial_condition([0., 1.])
+        u2, t2 = solver.solve(time_points)
+        nt.assert_almost_equal(np.abs(u - u2).max(), 0, delta=1E-14)
+        print('...ok')
+
+    print('Testing AdamsBashforth2 with backend="numba" and compact=False')
+    solver = odespy.AdamsBashforth2(f, compact=False)
+    solver.set_initial_condition([0., 1.])
+    u2, t2 = solver.solve(time_points)
+    nt.assert_almost_equal(np.abs(u - u2).max(), 0, delta=1E-14)
+    from odespy import _jit
+    for n in range(3, 20):
+        _jit.ab2_const_dt_loop(1./n)
+    nt.assert_equal(_jit._ab2_const_dt_loop.cache_info().currsize, 8)
+    print('...ok')
+
+def test_numba_fallback():
+    try:
+        import numba
+    except ImportError:
+        import unittest
+        raise unittest.SkipTest('numba is not installed')
+
+    @numba.njit
+    def f(u, t):
+        return np.array([u[1], -u[0]])
+
+    @numba.njit
+    def f_tuple(u, t):
+        return u[1], -u[0]
+
+    time_points = np.linspace(0, 5, 51)
+    terminate = lambda u, t, step_no: t[step_no] > 2.05
+    cases = [(odespy.RK4, f_tuple, {}, None),
+             (odespy.AdamsBashforth2, f, dict(start_method='MidpointIter'),
+              None),
+             (odespy.RK4, f, {}, terminate)]
+    for solver_class, f_, kwargs, terminate_ in cases:
+        print('Testing %s with njit f and fall back to backend="python"' %
+              solver_class.__name__)
+        solver = solver_class(f_, backend='python', **kwargs)
+        solver.set_initial_condition([0., 1.])
+        u, t = solver.solve(time_points, terminate=terminate_)
+        solver = solver_class(f_, **kwargs)
+        solver.set_initial_condition([0., 1.])
+        u2, t2 = solver.solve(time_points, terminate=terminate_)
+        nt.assert_equal(len(u2), len(u))
+        nt.assert_almost_equal(np.abs(u - u2).max(), 0, delta=1E-14)
+        print('...ok')
+
+def test_batch():
+    def f(u, t):
+        return np.array([u[1], -np.sin(u[0])])
+
+    def f_batch(U, t):
+        return np.column_stack([U[:,1], -np.sin(U[:,0])])
+
+    time_points = np.linspace(0, 3, 31)
+    Thetas = [0.1, 0.5, 1.0]
+    for solver_class in (odespy.ForwardEuler, odespy.Heun, odespy.RK4):
+        print('Testing %s with batch=True' % solver_class.__name__)
+        solver = solver_class(f_batch, batch=True)
+        solver.set_initial_condition([[Theta, 0] for Theta in Thetas])
+        U, t = solver.solve(time_points)
+        nt.assert_equal(U.shape, (31, 3, 2))
+        for i, Theta in enumerate(Thetas):
+            solver = solver_class(f)
+            solver.set_initial_condition([Theta, 0])
+            u, t = solver.solve(time_points)
+            nt.assert_almost_equal(np.abs(U[:,i,:] - u).max(), 0, delta=1E-14)
+        print('...ok')
+
+def test_cython_backend():
+    # backend='cython' falls back to the Python loop if the
+    # _steppers module is not compiled, so this test always runs
+    def f(u, t):
+        return [u[1], -u[0]]
+
+    time_points = np.linspace(0, 5, 51)
+    # (Leapfrog, RK2, RK3 and AdamsBashforth2 run advance in the
+    # general loop _steppers.advance_loop)
+    for solver_class in (odespy.ForwardEuler, odespy.Heun, odespy.RK4,
+                         odespy.Leapfrog, odespy.RK2, odespy.RK3,
+                         odespy.AdamsBashforth2):
+        print('Testing %s with backend="cython"' % solver_class.__name__)
+        solver = solver_class(f)
+        solver.set_initial_condition([0., 1.])
+        u, t = solver.solve(time_points)
+        solver = solver_class(f, backend='cython')
+        solver.set_initial_condition([0., 1.])
+        u2, t2 = solver.solve(time_points)
+        nt.assert_almost_equal(np.abs(u - u2).max(), 0, delta=1E-14)
+        print('...ok')
+
+def test_cuda_backend():
+    # Run with NUMBA_ENABLE_CUDASIM=1 to test without a GPU
+    import unittest
+    try:
+        from numba import cuda
+    except ImportError:
+        raise unittest.SkipTest('numba is not installed')
+    if not cuda.is_available():
+        raise unittest.SkipTest('no CUDA device')
+
+    def f(U, t, c):
+        return np.column_stack([U[:,1], -c*np.sin(U[:,0])])
+
+    time_points = np.linspace(0, 2, 21)
+    U0 = [[Theta, 0] for Theta in (0.1, 0.5, 1.0)]
+    for solver_class in (odespy.Heun, odespy.RK4):
+        print('Testing %s with backend="cuda"' % solver_class.__name__)
+        solver = solver_class(f, batch=True, f_args=(2.,))
+        solver.set_initial_condition(U0)
+        u, t = solver.solve(time_points)
+        solver = solver_class(f, batch=True, f_args=(2.,),
+                              backend='cuda', cuda_rhs='pendulum')
+        solver.set_initial_condition(U0)
+        u2, t2 = solver.solve(time_points)
+        nt.assert_almost_equal(np.abs(u - u2).max(), 0, delta=1E-12)
+        print('...ok')
+
+def test_numba_cfunc():
+    import unittest
+    try:
+        from numba import cfunc
+    except ImportError:
+        raise unittest.SkipTest('numba is not installed')
+
+    @cfunc('f8(f8, f8)')
+    def f(u, t):
+        return -u + t
+
+    time_points = np.linspace(0, 2, 21)
+    for solver_class in (odespy.ForwardEuler, odespy.Heun, odespy.RK4):
+        print('Testing %s with a numba.cfunc' % solver_class.__name__)
+        solver = solver_class(lambda u, t: -u + t)
+        solver.set_initial_condition(1.0)
+        u, t = solver.solve(time_points)
+        solver = solver_class(f, backend='numba')
+        solver.set_initial_condition(1.0)
+        u2, t2 = solver.solve(time_points)
+        nt.assert_almost_equal(np.abs(u - u2).max(), 0, delta=1E-14)
+        print('...ok')
+
+def test_linear_rhs():
+    print('Testing RK4 with LinearRHS')
+    c = 2.0
+    solver = odespy.RK4(odespy.LinearRHS([[0, 1], [-c, 0]]))
+    solver.set_initial_condition([0.1, 0])
+    time_points = np.linspace(0, 10, 101)
+    u, t = solver.solve(time_points)
+    u_exact = 0.1*np.cos(np.sqrt(c)*t)
+    nt.assert_almost_equal(np.abs(u[:,0] - u_exact).max(), 0, delta=1E-13)
+
+    solver = odespy.RK4(odespy.LinearRHS(-c))
+    solver.set_initial_condition(1.0)
+    u, t = solver.solve(time_points)
+    nt.assert_almost_equal(np.abs(u - np.exp(-c*t)).max(), 0, delta=1E-14)
+    print('...ok')
+
+def test_run_in_parallel():
+    print('Testing utils.run_in_parallel')
+    f = lambda u, t: -u
+    time_points = np.linspace(0, 3, 31)
+    solvers = [odespy.RK4(f), odespy.ThetaRule(f, theta=0),
+               odespy.ThetaRule(f, theta=1)]
+    results = odespy.utils.run_in_parallel(solvers, 1.0, time_points)
+    nt.assert_equal(sorted(results), ['RK4', 'ThetaRule', 'ThetaRule_2'])
+    for name, solver in zip(['RK4', 'ThetaRule', 'ThetaRule_2'], solvers):
+        solver.set_initial_condition(1.0)
+        u, t = solver.solve(time_points)
+        nt.assert_almost_equal(np.abs(results[name][0] - u).max(), 0,
+                               delta=1E-14)
+    print('...ok')
+
+def test_solve_piecewise():
+    f = lambda u, t: 2*u*(1 - u/1E+5)
+    breakpoints = [0, 1, 4, 8, 12];  N = [3, 7, 10, 10]
+    # (AdamsBashforth2 requires a constant time step and is
+    # restarted in each interval)
+    for solver_class in (odespy.RK4, odespy.AdamsBashforth2):
+        print('Testing utils.solve_piecewise with %s' % solver_class.__name__)
+        solver = solver_class(f)
+        U0 = 1.0
+        u_pieces = []
+        for i in range(len(N)):
+            solver.set_initial_condition(U0)
+            u, t = solver.solve(np.linspace(breakpoints[i], breakpoints[i+1],
+                                            N[i]+1))
+            U0 = u[-1]
+            u_pieces.append(u[:-1])
+        u_pieces.append([U0])
+        u_expected = np.concatenate(u_pieces)
+        u, t = odespy.utils.solve_piecewise(solver_class(f), 1.0,
+                                            breakpoints, N)
+        nt.assert_equal(len(t), sum(N) + 1)
+        nt.assert_equal(len(u), sum(N) + 1)
+        nt.assert_almost_equal(np.abs(u - u_expected).max(), 0, delta=1E-9)
+        print('...ok')
+
+def test_error_norms():
+    print('Testing errors.Linf and errors.L2')
+    u = np.linspace(0, 1, 11)
+    u_exact = np.sin(u)
+    buffer = np.empty_like(u)
+    e = u - u_exact
+    nt.assert_almost_equal(odespy.errors.Linf(u, u_exact, out=buffer),
+                           np.abs(e).max(), delta=1E-14)
+    nt.assert_almost_equal(odespy.errors.L2(u, u_exact, out=buffer),
+                           np.sqrt(np.sum(e**2)/10), delta=1E-14)
+    nt.assert_raises(ValueError, odespy.errors.Linf, u, u_exact[:-1])
+    nt.assert_raises(ValueError, odespy.errors.Linf, [], [])
+    nt.assert_raises(ValueError, odespy.errors.L2, u, u_exact[:-1])
+    print('...ok')
+
+def test_solve_dt_N():
+    print('Testing solve with dt and N')
+    solver = odespy.RK4(lambda u, t: -u)
+    solver.set_initial_condition(1.0)
+    u, t = solver.solve(np.linspace(1, 3, 21))
+    u2, t2 = solver.solve(start=1, dt=0.1, N=20)
+    nt.assert_equal(len(t2), 21)
+    nt.assert_almost_equal(np.abs(t - t2).max(), 0, delta=1E-14)
+    nt.assert_almost_equal(np.abs(u - u2).max(), 0, delta=1E-14)
+    print('...ok')
+
+def test_compile_c_rhs():
+    import unittest
+    try:
+        import Cython
+    except ImportError:
+        raise unittest.SkipTest('Cython is not installed')
+    code = """
+void user_rhs(double* u, double t, double* out, int n)
+{
+    out[0] = u[1];
+    out[1] = -u[0];
+}
+"""
+    f = odespy.compile_c_rhs(code, 2)
+    time_points = np.linspace(0, 5, 51)
+    print('Testing RK4 with f from compile_c_rhs')
+    solver = odespy.RK4(lambda u, t: [u[1], -u[0]])
+    solver.set_initial_condition([0., 1.])
+    u, t = solver.solve(time_points)
+    solver = odespy.RK4(f)
+    solver.set_initial_condition([0., 1.])
+    u2, t2 = solver.solve(time_points)
+    nt.assert_almost_equal(np.abs(u - u2).max(), 0, delta=1E-14)
+    # the C function takes no extra arguments
+    nt.assert_raises(ValueError, odespy.RK4, f, f_args=(1.0,))
+    # and u must have the compiled length
+    nt.assert_raises(ValueError, f, [1.0], 0.0)
+    nt.assert_raises(ValueError, solver.set_initial_condition, 1.0)
+    print('...ok')
+
+def test_linear_forward_euler():
+    print('Testing ForwardEuler with f_is_linear=True')
+    time_points = np.linspace(0, 5, 201)
+    # (the last three are linear in u, but not f = A*u with constant A,
+    # and must be computed by the ordinary time loop)
+    cases = [(lambda u, t: -0.5*u, 2.0),
+             (lambda u, t: [u[1], -u[0]], [0., 1.]),
+             (lambda u, t: -u + 1, 0.5),
+             (lambda u, t: -t*u, 1.0),
+             (lambda u, t: [u[1] + 1, -u[0]], [0., 1.])]
+    for i, (f, U0) in enumerate(cases):
+        solver = odespy.ForwardEuler(f)
+        solver.set_initial_condition(U0)
+        u, t = solver.solve(time_points)
+        solver = odespy.ForwardEuler(f, f_is_linear=True)
+        solver.set_initial_condition(U0)
+        u2, t2 = solver.solve(time_points)
+        nt.assert_equal(solver._linear_matrix is not None, i < 2)
+        nt.assert_almost_equal(np.abs(u - u2).max(), 0, delta=1E-12)
+    print('...ok')
+
+def test_u_dtype():
+    print('Testing RK4 with u_dtype=np.float32')
+    time_points = np.linspace(0, 1, 11)
+    solver = odespy.RK4(lambda u, t: -u, u_dtype=np.float32)
+    solver.set_initial_condition(np.ones(3))
+    u, t = solver.solve(time_points)
+    nt.assert_equal(u.dtype, np.float32)
+    nt.assert_almost_equal(u[-1,0], np.exp(-1), delta=1E-5)
+    print('...ok')
+
+def test_f_out_arg():
+    print('Testing AdamsBashforth2 with f_out_arg=True')
+    def f(u, t, out=None):
+        if out is None:
+            out = np.empty_like(u)
+        out[0] = u[1];  out[1] = -u[0]
+        return out
+
+    time_points = np.linspace(0, 5, 51)
+    solver = odespy.AdamsBashforth2(f)
+    solver.set_initial_condition([0., 1.])
+    u, t = solver.solve(time_points)
+    solver = odespy.AdamsBashforth2(f, f_out_arg=True)
+    solver.set_initial_condition([0., 1.])
+    u2, t2 = solver.solve(time_points)
+    nt.assert_almost_equal(np.abs(u - u2).max(), 0, delta=1E-14)
+    print('...ok')
+
+def test_fd_jacobian_states():
+    print('Testing finite difference Jacobian with f(U, t) for many states')
+    from odespy.solvers import approx_Jacobian, _f_accepts_states
+    A = np.array([[-1., 2, 0], [0, -3, 1], [0.5, 0, -2]])
+    f = lambda u, t: u.dot(A.T)     # also works for rows of states
+    nt.assert_equal(_f_accepts_states(f, [1., 2, 3], 0), True)
+    nt.assert_equal(_f_accepts_states(
+        lambda u, t: [u[1], -u[0]], [1., 2], 0), False)
+    u0 = np.array([1., 2, 3])
+    J = approx_Jacobian(f, u0, 0, 1E-6, vectorized=True)
+    nt.assert_almost_equal(np.abs(J - A).max(), 0, delta=1E-7)
+    J2 = approx_Jacobian(f, u0, 0, 1E-6)
+    nt.assert_almost_equal(np.abs(J - J2).max(), 0, delta=1E-14)
+
+    time_points = np.linspace(0, 1, 11)
+    solver = odespy.BackwardEuler(f, nonlinear_solver='Newton')
+    solver.set_initial_condition(u0)
+    u, t = solver.solve(time_points)
+    solver = odespy.BackwardEuler(f, nonlinear_solver='Newton',
+                                  f_vectorized=True)
+    solver.set_initial_condition(u0)
+    u2, t2 = solver.solve(time_points)
+    nt.assert_almost_equal(np.abs(u - u2).max(), 0, delta=1E-12)
+
+    # f for one state only: gives wrong values (no error) for many states
+    f = lambda u, t: -u*np.sum(u)
+    nt.assert_equal(_f_accepts_states(f, u0, 0), False)
+    solver = odespy.BackwardEuler(f, nonlinear_solver='Newton',
+                                  f_vectorized=True)
+    solver.set_initial_condition(u0)
+    nt.assert_raises(ValueError, solver.solve, time_points)
+    print('...ok')
+
+def test_adams_nonuniform_mesh():
+    # The Adams methods step with a constant dt and must reject
+    # a non-uniform mesh
+    time_points = np.linspace(0, 1, 41)**2*4
+    for solver_class in (odespy.AdamsBashforth2, odespy.AdamsBashforth3,
+                         odespy.AdamsBashforth4, odespy.AdamsBashMoulton2,
+                         odespy.AdamsBashMoulton3):
+        print('Testing %s with a non-uniform mesh' % solver_class.__name__)
+        solver = solver_class(lambda u, t: -u)
+        solver.set_initial_condition(1.0)
+        nt.assert_raises(ValueError, solver.solve, time_points)
+        u, t = solver.solve(np.linspace(0, 4, 401))
+        nt.assert_almost_equal(u[-1], np.exp(-4), delta=1E-4)
+        print('...ok')
+
+def test_f_args_assignment():
+    time_points = np.linspace(0, 1, 11)
+    f = lambda u, t, a, b=0: -a*u + b
+    for solver_class in (odespy.RK4, odespy.AdamsBashforth2):
+        print('Testing %s with f_args and f_kwargs assigned directly' %
+              solver_class.__name__)
+        solver = solver_class(f, f_args=(1.0,))
+        solver.set_initial_condition(1.0)
+        u, t = solver.solve(time_points)
+        solver.f_args = (2.0,)
+        solver.f_kwargs = {'b': 1.0}
+        u2, t2 = solver.solve(time_points)
+        solver = solver_class(f, f_args=(2.0,), f_kwargs={'b': 1.0})
+        solver.set_initial_condition(1.0)
+        u3, t3 = solver.solve(time_points)
+        nt.assert_almost_equal(np.abs(u2 - u3).max(), 0, delta=1E-14)
+        nt.assert_almost_equal(u2[-1], 0.5 + 0.5*np.exp(-2), delta=1E-2)
+        print('...ok')
+
+def test_get():
+    print('Testing Solver.get and repr')
+    solver = odespy.ThetaRule(lambda u, t: -u)
+    prm = solver.get()
+    nt.assert_equal(type(prm), dict)
+    prm['theta'] = 0.2          # must not change the solver
+    nt.assert_equal(solver.get()['theta'], 0.5)
+    solver.set(theta=1.0)
+    nt.assert_equal(solver.get()['theta'], 1.0)
+    solver.theta = 0.1          # direct assignment, as in set
+    nt.assert_equal(solver.get()['theta'], 0.1)
+    nt.assert_equal('theta=0.1' in repr(solver), True)
+    print('...ok')
+
+def test_strict_array_f():
+    time_points = np.linspace(0, 5, 51)
+    f_list = lambda u, t: [u[1], -u[0]]
+    f_array = lambda u, t: np.array([u[1], -u[0]])
+    solver = odespy.Heun(f_list)
+    solver.set_initial_condition([0., 1.])
+    u, t = solver.solve(time_points)
+    for f, strict_array_f in [(f_list, False), (f_array, True)]:
+        print('Testing Heun with strict_array_f=%s' % strict_array_f)
+        solver = odespy.Heun(f, strict_array_f=strict_array_f)
+        solver.set_initial_condition([0., 1.])
+        u2, t2 = solver.solve(time_points)
+        # f is called directly only if it is promised to return arrays
+        nt.assert_equal(solver.f is solver._f_raw, strict_array_f)
+        nt.assert_almost_equal(np.abs(u - u2).max(), 0, delta=1E-14)
+        print('...ok')
+
+def test_f_array_detection():
+    print('Testing detection of f returning arrays')
+    time_points = np.linspace(0, 5, 51)
+    f_list = lambda u, t: [u[1], -u[0]]
+    f_array = lambda u, t: np.array([u[1], -u[0]])
+    results = []
+    for f, is_array in [(f_list, False), (f_array, True)]:
+        solver = odespy.ForwardEuler(f)
+        solver.set_initial_condition([0., 1.])
+        u, t = solver.solve(time_points)
+        # the first call of f decides if the asarray wrapper is skipped
+        nt.assert_equal(solver.f is solver._f_raw, is_array)
+        nt.assert_equal(solver.f is solver._f_asarray, not is_array)
+        results.append(u)
+    nt.assert_almost_equal(np.abs(results[0] - results[1]).max(), 0,
+                           delta=1E-14)
+    print('...ok')
+
+def test_inplace_steps():
+    time_points = np.linspace(0, 2, 41)
+    f = lambda u, t: np.array([u[1], -u[0]])
+    for solver_class in (odespy.ForwardEuler, odespy.AdamsBashforth2):
+        print('Testing %s with u[n+1] computed in place' %
+              solver_class.__name__)
+        solver = solver_class(f)
+        solver.set_initial_condition([0., 1.])
+        u, t = solver.solve(time_points)
+        solver = solver_class(f)
+        solver._inplace_min_size = 1    # as for large systems
+        solver.set_initial_condition([0., 1.])
+        u2, t2 = solver.solve(time_points)
+        nt.assert_equal(solver.advance, solver._advance_inplace)
+        nt.assert_almost_equal(np.abs(u - u2).max(), 0, delta=1E-14)
+        print('...ok')
+
+def test_ab2_scratch():
+    print('Testing AdamsBashforth2 for a system (help array for u[n+1])')
+    time_points = np.linspace(0, 2, 41)
+    a = np.array([1., 3.])
+    solver = odespy.AdamsBashforth2(lambda u, t: -a*u)
+    solver.set_initial_condition([1., 2.])
+    u, t = solver.solve(time_points)
+    nt.assert_equal(solver.advance, solver._advance_scratch)
+    # the same decoupled ODEs as scalar problems (advance in the class)
+    for i in range(2):
+        solver = odespy.AdamsBashforth2(lambda u, t: -a[i]*u)
+        solver.set_initial_condition(u[0,i])
+        u_i, t_i = solver.solve(time_points)
+        nt.assert_almost_equal(np.abs(u[:,i] - u_i).max(), 0, delta=1E-14)
+    print('...ok')
+
+def test_constant_time_step():
+    print('Testing Solver.constant_time_step')
+    solver = odespy.RK4(lambda u, t: -u)
+    solver.set_initial_condition(1.0)
+    # (round-off in the time points is accepted)
+    for time_points, uniform in [(np.linspace(0, 1, 11), True),
+                                 (0.1*np.arange(11), True),
+                                 (np.linspace(0, 1, 11)**2, False),
+                                 (np.linspace(0, 1, 2), True),
+                                 (np.linspace(1E6, 1E6+1, 10001), True),
+                                 (np.linspace(1E9, 1E9+1, 1001), True),
+                                 (1E6 + np.linspace(0, 1, 11)**2, False)]:
+        solver.solve(time_points)   # (the result is recomputed in solve)
+        nt.assert_equal(solver.constant_time_step(), uniform)
+    # Adams methods require a constant time step
+    solver = odespy.AdamsBashforth3(lambda u, t: -u)
+    solver.set_initial_condition(1.0)
+    u, t = solver.solve(np.linspace(1E6, 1E6+1, 10001))
+    nt.assert_almost_equal(u[-1], np.exp(-1), delta=1E-6)
+    print('...ok')
+
+def test_rk4_small_problems():
+    def rk4(f, U0, t):
+        # reference implementation of RK4 with arrays
+        u = [np.asarray(U0, dtype=float)]
+        for n in range(len(t) - 1):
+            dt = t[n+1] - t[n]
+            K1 = dt*np.asarray(f(u[n], t[n]))
+            K2 = dt*np.asarray(f(u[n] + 0.5*K1, t[n] + 0.5*dt))
+            K3 = dt*np.asarray(f(u[n] + 0.5*K2, t[n] + 0.5*dt))
+            K4 = dt*np.asarray(f(u[n] + K3, t[n] + dt))
+            u.append(u[n] + (1/6.0)*(K1 + 2*K2 + 2*K3 + K4))
+        return np.array(u)
+
+    time_points = np.linspace(0, 3, 31)
+    for f, U0, method in [(lambda u, t: -u + t, 1.0, '_advance_scalar'),
+                          (lambda u, t: [u[1], -u[0] + t], [0., 1.],
+                           '_advance_d2')]:
+        print('Testing RK4.%s' % method)
+        solver = odespy.RK4(f)
+        solver.set_initial_condition(U0)
+        u, t = solver.solve(time_points)
+        nt.assert_equal(solver.advance, getattr(solver, method))
+        nt.assert_almost_equal(np.abs(u - rk4(f, U0, time_points)).max(), 0,
+                               delta=1E-14)
+        print('...ok')
+
+def test_rk4_u_buffer():
+    print('Testing RK4 for a scalar ODE with u in a ctypes buffer')
+    f = lambda u, t: -u
+    time_points = np.linspace(0, 2, 21)
+    solver = odespy.RK4(f)
+    solver.set_initial_condition(1.0)
+    u, t = solver.solve(time_points)
+    nt.assert_equal(solver._u_buffer is not None, True)
+    nt.assert_equal(np.shares_memory(u, np.frombuffer(solver._u_buffer)),
+                    True)
+    nt.assert_almost_equal(np.abs(u - np.exp(-t)).max(), 0, delta=1E-5)
+    u_first = u.copy()
+    # a new solve gets a new buffer, u from the first solve is kept
+    u2, t2 = solver.solve(time_points, terminate=lambda u, t, n: t[n] >= 1)
+    nt.assert_equal(len(u2), 11)
+    nt.assert_almost_equal(np.abs(u2 - u_first[:11]).max(), 0, delta=1E-14)
+    nt.assert_almost_equal(np.abs(u - u_first).max(), 0, delta=1E-14)
+    print('...ok')
+
+def test_doc_toc_aliases():
+    print('Testing the solver table in the odespy doc string')
+    toc = odespy.__doc__.split('Short description')[1].split('\n\n')[0]
+    names = [line.split()[0] for line in toc.splitlines()[2:-1]]
+    for alias in 'Euler', 'CrankNicolson', 'Trapezoidal', 'ForwardEuler':
+        nt.assert_equal(names.count(alias), 1)
+    nt.assert_equal(odespy.Euler.__doc__.count('Optional input arguments:'), 1)
+    print('...ok')
+
 
 if __name__ == '__main__':
     test_exponentinal()
@@ -369,3 +938,31 @@ if __name__ == '__main__':
     test_EulerCromer_1dof()
     test_switch_to()
     test_terminate()
+    test_terminate_vectorized()
+    test_numba_backend()
+    test_numba_fallback()
+    test_batch()
+    test_cython_backend()
+    test_cuda_backend()
+    test_numba_cfunc()
+    test_linear_rhs()
+    test_run_in_parallel()
+    test_solve_piecewise()
+    test_error_norms()
+    test_solve_dt_N()
+    test_compile_c_rhs()
+    test_linear_forward_euler()
+    test_u_dtype()
+    test_f_out_arg()
+    test_fd_jacobian_states()
+    test_adams_nonuniform_mesh()
+    test_f_args_assignment()
+    test_get()
+    test_strict_array_f()
+    test_f_array_detection()
+    test_inplace_steps()
+    test_ab2_scratch()
+    test_constant_time_step()
+    test_rk4_small_problems()
+    test_rk4_u_buffer()
+    test_doc_toc_aliases()
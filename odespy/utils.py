@@ -0,0 +1,131 @@
+"""
+Utilities for running several solvers and solving problems in parts.
+"""
+
+import numpy as np
+
+
+def _solver_spec(solver):
+    """
+    Return (class, f, kwargs) such that ``class(f, **kwargs)`` is a
+    fresh solver with the same parameters as ``solver``. A solver
+    object may hold wrapped functions and extension module objects
+    that cannot be pickled (e.g. the Fortran-based ODEPACK solvers),
+    while the class, the user's functions and the parameter values
+    normally can.
+    """
+    kwargs = {}
+    for name in solver._optional_parameters:
+        if name in solver.__dict__:
+            kwargs[name] = solver.__dict__[name]
+    # initialize_for_solve may have wrapped the user's jac
+    if 'jac' in kwargs and hasattr(solver, 'users_jac'):
+        kwargs['jac'] = solver.users_jac
+    return solver.__class__, solver.users_f, kwargs
+
+
+def _solve(spec, U0, time_points, terminate):
+    solver_class, f, kwargs = spec
+    solver = solver_class(f, **kwargs)
+    solver.set_initial_condition(U0)
+    return solver.solve(time_points, terminate)
+
+
+def run_in_parallel(solvers, U0, time_points, terminate=None, n_jobs=-1):
+    """
+    Solve the same problem, with initial condition ``U0``, by all the
+    solver objects in the list ``solvers`` at the given time points,
+    with the solvers running in parallel processes (one per solver,
+    but at most ``n_jobs`` at a time, where -1 means one per CPU core).
+    Return a dict mapping solver names to the (u, t) results of
+    ``solve``. The name is the class name (with ``_2``, ``_3``, ...
+    added if several solvers of the same class are given)::
+
+        solvers = [odespy.RK4(f), odespy.ThetaRule(f, theta=0.5)]
+        results = odespy.utils.run_in_parallel(solvers, U0, time_points)
+        u, t = results['RK4']
+
+    Each process makes a new instance of the solver class from the
+    user's f and the parameters set in the given solver, so these
+    must be picklable (joblib's process pool also pickles lambda
+    functions). The solver objects in ``solvers`` are not changed.
+    The solvers are run one after the other if joblib is not installed.
+    """
+    names = []
+    for solver in solvers:
+        name = solver.__class__.__name__
+        if name in names:
+            i = 2
+            while '%s_%d' % (name, i) in names:
+                i += 1
+            name = '%s_%d' % (name, i)
+        names.append(name)
+
+    specs = [_solver_spec(solver) for solver in solvers]
+    try:
+        from joblib import Parallel, delayed, cpu_count
+    except ImportError:
+        results = [_solve(spec, U0, time_points, terminate)
+                   for spec in specs]
+    else:
+        if n_jobs < 0:
+            n_jobs = cpu_count()
+        results = Parallel(n_jobs=min(n_jobs, len(specs)), backend='loky')(
+            delayed(_solve)(spec, U0, time_points, terminate)
+            for spec in specs)
+    return dict(zip(names, results))
+
+
+def solve_piecewise(solver, U0, breakpoints, N_per_piece):
+    """
+    Solve the ODE problem by ``solver`` from the initial condition
+    ``U0`` at ``breakpoints[0]`` over the intervals
+    [breakpoints[0], breakpoints[1]], [breakpoints[1], breakpoints[2]],
+    ..., with ``N_per_piece`` (a number, or a list with one number per
+    interval) uniform time steps in each interval. The solution at the
+    end of one interval is the initial condition in the next, as when
+    ``solve`` is called once for each interval, but the time points of
+    all the intervals are joined such that ``solve`` is called only
+    once. Return u and t at all the time points (the breakpoints
+    included, each of them once)::
+
+        u, t = odespy.utils.solve_piecewise(
+            odespy.RK4(f), U0, [0, 1, 4, 8, 12], [3, 7, 10, 10])
+
+    Methods that require a constant time step (the Adams methods)
+    cannot be used on the joined mesh if the intervals have different
+    time steps. ``solve`` is then called once for each interval (as
+    when restarting the solver manually), and ``solver.u`` and
+    ``solver.t`` hold the solution in the last interval only.
+    """
+    breakpoints = np.asarray(breakpoints, dtype=float)
+    n_pieces = breakpoints.size - 1
+    if n_pieces < 1:
+        raise ValueError('solve_piecewise: breakpoints %s must have at least two elements' % breakpoints)
+    if np.isscalar(N_per_piece):
+        N_per_piece = [N_per_piece]*n_pieces
+    elif len(N_per_piece) != n_pieces:
+        raise ValueError('solve_piecewise: N_per_piece has length %d, but there are %d intervals' % (len(N_per_piece), n_pieces))
+
+    time_points = [np.linspace(breakpoints[i], breakpoints[i+1],
+                               int(N_per_piece[i]) + 1)[:-1]
+                   for i in range(n_pieces)]
+    time_points.append(breakpoints[-1:])
+    t = np.concatenate(time_points)
+    dt = np.diff(t)
+    if getattr(solver, '_constant_step_only', False) and \
+       not np.allclose(dt, dt[0], rtol=1E-6, atol=0):
+        # Restart the solver at each breakpoint, with a uniform
+        # mesh in each interval
+        u_pieces = []
+        for i in range(n_pieces):
+            solver.set_initial_condition(U0)
+            u, t_piece = solver.solve(
+                np.append(time_points[i], breakpoints[i+1]))
+            U0 = u[-1]
+            u_pieces.append(u[:-1])
+        u_pieces.append(u[-1:])
+        return np.concatenate(u_pieces), t
+
+    solver.set_initial_condition(U0)
+    return solver.solve(t)
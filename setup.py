@@ -48,6 +48,24 @@ if __name__ == '__main__':
     else:
         # Run plain distutils
         from distutils.core import setup
+        kwargs = {'package_data': {'odespy': ['_tutorial.txt', '_frhs.pyx']}}
+        try:
+            # Time loops in Cython (optional, used with backend='cython')
+            from Cython.Build import cythonize
+            kwargs['ext_modules'] = cythonize(join('odespy', '_steppers.pyx'))
+        except ImportError:
+            pass
+        try:
+            # Ahead-of-time compiled time loops (optional, used with
+            # backend='numba' when f is a numba.cfunc)
+            import numba.pycc
+            sys.path.insert(0, 'odespy')
+            import _aot_build
+            cc = _aot_build.make_cc()
+            cc.compile()
+            kwargs['package_data']['odespy'].append(cc.output_file)
+        except ImportError:
+            pass
         setup(
             name=name,
             version=version,
@@ -58,4 +76,5 @@ if __name__ == '__main__':
             author_email=author_email,
             description='',
             packages=['odespy'],
+            **kwargs
             )